@@ -1,10 +1,10 @@
 from __future__ import annotations
 from typing import Any, Dict, Optional
 from enum import IntEnum
-from uuid import uuid4
 
+import orjson
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
@@ -45,24 +45,31 @@ DEFAULT_CODE_BY_STATUS: Dict[int, ErrorCode] = {
 }
 
 
-class ErrorResponse(JSONResponse):
-    """JSONResponse with standard error body and x-trace-id header."""
+def _error_body(code: int, message: str, trace_id: str, details: Optional[Dict[str, Any]] = None) -> bytes:
+    content: Dict[str, Any] = {
+        "code": int(code),
+        "message": message,
+        "trace_id": trace_id,
+    }
+    if details:
+        content["details"] = details
+    # default=str covers non-JSON leftovers (e.g. exception objects in validation ctx)
+    return orjson.dumps(content, default=str)
 
-    def __init__(self, *, status_code: int, code: int, message: str, trace_id: str, details: Optional[Dict[str, Any]] = None) -> None:
-        content = {
-            "code": int(code),
-            "message": message,
-            "trace_id": trace_id,
-        }
-        if details:
-            content["details"] = details
-        headers = {"x-trace-id": trace_id}
-        super().__init__(status_code=status_code, content=content, headers=headers)
+
+def _render_error(status: int, code: int, message: str, trace_id: str, details: Optional[Dict[str, Any]] = None) -> Response:
+    """Standard error body serialized once with orjson, plus x-trace-id header."""
+    return Response(
+        content=_error_body(code, message, trace_id, details),
+        status_code=status,
+        media_type="application/json",
+        headers={"x-trace-id": trace_id},
+    )
 
 
 def _ensure_trace_id(request: Request) -> str:
-    # Prefer middleware-injected trace_id; fallback to header; else new one
-    return getattr(request.state, "trace_id", None) or request.headers.get("x-trace-id") or str(uuid4())
+    # ObservabilityMiddleware stores the canonical trace_id in scope["state"] for every http request
+    return request.state.trace_id
 
 
 def _log_error(level: str, message: str, *, trace_id: str, module: str, extra: Optional[Dict[str, Any]] = None) -> None:
@@ -83,7 +90,7 @@ def _inc_metric(name: str, value: int = 1) -> None:
         pass
 
 
-async def http_exception_handler(request: Request, exc: StarletteHTTPException) -> JSONResponse:
+async def http_exception_handler(request: Request, exc: StarletteHTTPException) -> Response:
     trace_id = _ensure_trace_id(request)
     status = exc.status_code or 500
 
@@ -114,27 +121,28 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException)
     _log_error("WARN" if status < 500 else "ERROR", f"HTTPException {status}: {message}", trace_id=trace_id, module="errors", extra={"status": status, "code": code})
     _inc_metric("http_exceptions_total", 1)
 
-    return ErrorResponse(status_code=status, code=code, message=message, trace_id=trace_id, details=details or None)
+    return _render_error(status, code, message, trace_id, details or None)
 
 
-async def validation_exception_handler(request: Request, exc: RequestValidationError) -> JSONResponse:
+async def validation_exception_handler(request: Request, exc: RequestValidationError) -> Response:
     trace_id = _ensure_trace_id(request)
     # FastAPI defaults to 422; keep it but use unified code
     status = 422
     code = int(ErrorCode.VALIDATION_ERROR)
     try:
-        # exc.errors() is a list of error objects
-        details = {"errors": exc.errors()}
+        # exc.errors() is a list of error dicts (FastAPI already omits "url"); drop the echoed
+        # request "input" to keep 422 bodies small, the rest is serialized as-is by orjson
+        details = {"errors": [{k: v for k, v in e.items() if k != "input"} for e in exc.errors()]}
     except Exception:
         details = {"errors": [str(exc)]}
 
     _log_error("WARN", "Validation error", trace_id=trace_id, module="errors")
     _inc_metric("request_validation_total", 1)
 
-    return ErrorResponse(status_code=status, code=code, message="validation error", trace_id=trace_id, details=details)
+    return _render_error(status, code, "validation error", trace_id, details)
 
 
-async def unhandled_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def unhandled_exception_handler(request: Request, exc: Exception) -> Response:
     trace_id = _ensure_trace_id(request)
     status = 500
     code = int(ErrorCode.INTERNAL)
@@ -142,7 +150,7 @@ async def unhandled_exception_handler(request: Request, exc: Exception) -> JSONR
     _log_error("ERROR", f"Unhandled exception: {exc}", trace_id=trace_id, module="errors")
     _inc_metric("unhandled_exceptions_total", 1)
 
-    return ErrorResponse(status_code=status, code=code, message="internal error", trace_id=trace_id, details={"type": exc.__class__.__name__})
+    return _render_error(status, code, "internal error", trace_id, {"type": exc.__class__.__name__})
 
 
 def register_exception_handlers(app: FastAPI) -> None:
@@ -0,0 +1,44 @@
+from __future__ import annotations
+import os
+import threading
+
+# random bytes are pulled from the OS in blocks; one uuid consumes 16 of them
+_BLOCK_SIZE = 4096
+_VARIANT_NIBBLE = "89ab89ab89ab89ab"
+
+
+class _Pool(threading.local):
+    buf: bytes = b""
+    pos: int = 0
+
+
+_pool = _Pool()
+
+
+def _reset_pool_in_child() -> None:
+    # a forked child inherits the parent's buffered bytes; drawing from them would repeat the
+    # parent's UUIDs, so the child refills from os.urandom on first use
+    _pool.buf = b""
+    _pool.pos = 0
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pool_in_child)
+
+
+def uuid4_str() -> str:
+    """Random RFC 4122 version-4 UUID in canonical string form.
+
+    Equivalent to ``str(uuid.uuid4())`` but draws from a per-thread block of
+    ``os.urandom`` bytes and formats the hex directly instead of building a
+    ``uuid.UUID`` object per call.
+    """
+    pool = _pool
+    pos = pool.pos
+    if pos >= len(pool.buf):
+        pool.buf = os.urandom(_BLOCK_SIZE)
+        pos = 0
+    pool.pos = pos + 16
+    h = pool.buf[pos:pos + 16].hex()
+    # version nibble forced to 4, variant bits to 10xx
+    return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{_VARIANT_NIBBLE[int(h[16], 16)]}{h[17:20]}-{h[20:]}"
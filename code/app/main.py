@@ -1,6 +1,8 @@
 import os
-import json
-from datetime import datetime, timezone
+import sys
+import asyncio
+import warnings
+import orjson
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 from fastapi import FastAPI
@@ -10,7 +12,7 @@ from fastapi.openapi.docs import (
     get_redoc_html,
     get_swagger_ui_oauth2_redirect_html,
 )
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 
 from .routes.health import router as health_router
 from .routes.v2_3.consciousness import router as consciousness_router
@@ -22,18 +24,31 @@ from .routes.v2_3.observability import (
     router as observability_router,
     metrics as obs_metrics,
     logs as obs_logs,
+    drain_http_events,
+    run_http_event_drainer,
 )
 from .routes.v2_3.experience import router as experience_router
 from .routes.v2_3.experience import store as exp_store, ExperienceRule
 from .routes.v2_3.agents import router as agents_router
 
-from uuid import uuid4
-
 from .errors import register_exception_handlers  # NEW
+from .middleware import ObservabilityMiddleware, ProfilerMiddleware
+from .timeutil import iso_now
 
 
 SERVICE_NAME = "starriver-superbrain-v2.3"
 API_VERSION = "v2.3-preview"
+OPENAPI_URL = "/openapi.json"
+
+
+def _openapi_bytes(app: FastAPI) -> bytes:
+    """Serialize the OpenAPI schema once; re-serialize only when app.openapi() yields a new schema."""
+    schema = app.openapi()
+    cached = getattr(app.state, "openapi_bytes", None)
+    if cached is None or cached[0] is not schema:
+        cached = (schema, orjson.dumps(schema))
+        app.state.openapi_bytes = cached
+    return cached[1]
 
 
 @asynccontextmanager
@@ -42,8 +57,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     path = getattr(app.state, "experience_snapshot_path", "data/experience.snapshot.json")
     try:
         if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with open(path, "rb") as f:
+                data = orjson.loads(f.read())
             items_compact = data.get("items_compact") or []
             items_full = data.get("items") or []
             items = [ExperienceRule.from_compact(d) for d in items_compact] if items_compact else [ExperienceRule(**d) for d in items_full]
@@ -51,10 +66,6 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             cnt, _ = exp_store.stats()
             try:
                 obs_metrics.inc("experience_snapshot_load_total", 1)
-                obs_metrics.set_gauge("experience_rules_total", float(cnt))
-                # also refresh candidate (draft) gauge after load
-                cand_cnt = sum(1 for r in exp_store.list_all() if (r.status or "").lower() == "draft")
-                obs_metrics.set_gauge("experience_candidates_total", float(cand_cnt))
             except Exception:
                 pass
             try:
@@ -89,15 +100,31 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             )
         except Exception:
             pass
-    
+
+    # Build and serialize the OpenAPI schema before serving, so the first /openapi.json
+    # (or /docs) request does not pay for it; a failure here surfaces on that request instead
+    try:
+        _openapi_bytes(app)
+    except Exception:
+        pass
+
+    # Fold deferred per-request http events into metrics/logs off the request path
+    drainer = asyncio.create_task(run_http_event_drainer())
+
     yield
-    
+
     # Shutdown
+    drainer.cancel()
+    try:
+        await drainer
+    except asyncio.CancelledError:
+        pass
+    drain_http_events()
     try:
         items = exp_store.list_all()
         payload = {
             "items_compact": [r.to_compact() for r in items],
-            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "updated_at": iso_now(),
             "version": API_VERSION,
         }
         # ensure directory
@@ -108,8 +135,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         except Exception:
             pass
         tmp = f"{path}.tmp"
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False)
+        with open(tmp, "wb") as f:
+            f.write(orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS))
         os.replace(tmp, path)
         try:
             obs_metrics.inc("experience_snapshot_save_total", 1)
@@ -147,6 +174,8 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
         docs_url=None,   # disable default Swagger UI
         redoc_url=None,  # disable default ReDoc
+        openapi_url=None,  # served below from cached bytes
+        default_response_class=ORJSONResponse,  # orjson-backed JSON for all routes
     )
 
     # Register global error handlers (unified errors)
@@ -176,59 +205,35 @@ def create_app() -> FastAPI:
     # ---- Experience snapshot auto load/save (P0) ----
     app.state.experience_snapshot_path = os.getenv("EXPERIENCE_SNAPSHOT_PATH", "data/experience.snapshot.json")
 
-    # ---- Observability middleware (v0) ----
-    import time
-
-    @app.middleware("http")
-    async def observability_middleware(request, call_next):
-        start = time.perf_counter()
-        method = request.method
-        path = request.url.path
-        status = 500
-        # trace id propagation
-        trace_id = request.headers.get("x-trace-id") or str(uuid4())
-        setattr(request.state, "trace_id", trace_id)
+    # ---- Observability middleware (v0, pure ASGI) ----
+    app.add_middleware(ObservabilityMiddleware)
+    # opt-in hotspot profiling via ?profile=1 (requires pyinstrument); off unless PROFILE is set
+    if os.getenv("PROFILE"):
         try:
-            response = await call_next(request)
-            status = getattr(response, "status_code", 200)
-            # set trace id header
-            try:
-                response.headers["x-trace-id"] = trace_id
-            except Exception:
-                pass
-            return response
-        except Exception as e:  # record error and re-raise
+            import pyinstrument  # noqa: F401
+        except ImportError:
+            msg = "PROFILE is set but pyinstrument is not installed (pip install -r requirements-dev.txt); profiler disabled"
+            warnings.warn(msg, RuntimeWarning, stacklevel=2)
             try:
-                obs_logs.add(
-                    "ERROR",
-                    f"Unhandled error: {e}",
-                    module="http",
-                    tags=["exception", method, path, trace_id],
-                    extra={"trace_id": trace_id},
-                )
-            except Exception:
-                pass
-            raise
-        finally:
-            dur_ms = (time.perf_counter() - start) * 1000.0
-            try:
-                obs_metrics.inc(f"http_requests_total|{method}|{path}|{status}", 1)
-                obs_metrics.observe(f"http_request_duration_ms|{method}|{path}", dur_ms)
-                level = "INFO" if status < 400 else ("WARN" if status < 500 else "ERROR")
-                obs_logs.add(
-                    level,
-                    f"{method} {path} -> {status} in {dur_ms:.2f}ms",
-                    module="http",
-                    tags=[method, path, str(status), trace_id],
-                    extra={"duration_ms": round(dur_ms, 2), "trace_id": trace_id},
-                )
+                obs_logs.add("WARN", msg, module="main", tags=["profile", "skip"])
             except Exception:
-                # best-effort; never block request on metrics/logging
                 pass
+        else:
+            app.add_middleware(ProfilerMiddleware)
+
+    # constant for the process lifetime: serialize once, serve the same bytes
+    root_bytes = orjson.dumps({"service": SERVICE_NAME, "version": API_VERSION, "status": "ok"})
 
     @app.get("/", tags=["meta"]) 
-    def root():
-        return {"service": SERVICE_NAME, "version": API_VERSION, "status": "ok"}
+    async def root():
+        return Response(root_bytes, media_type="application/json")
+
+    # ---- OpenAPI JSON (cached bytes instead of re-encoding per request) ----
+    app.openapi_url = OPENAPI_URL
+
+    @app.get(OPENAPI_URL, include_in_schema=False)
+    async def openapi_json() -> Response:
+        return Response(content=_openapi_bytes(app), media_type="application/json")
 
     # ---- Custom Docs (use unpkg CDN as fallback to jsDelivr) ----
     @app.get("/docs", include_in_schema=False)
@@ -260,6 +265,10 @@ def create_app() -> FastAPI:
             schema = app.openapi()
         except Exception as e:
             schema = {"error": f"failed to generate openapi: {e}"}
+        # Rendered page is cached per schema object; app.openapi() returns the same dict until reset
+        cached = getattr(app.state, "docs_lite_html", None)
+        if cached is not None and cached[0] is schema:
+            return HTMLResponse(content=cached[1])
         paths_len = len((schema.get("paths") or {})) if isinstance(schema, dict) else 0
         tags_list = ", ".join([str(t.get("name", "")) for t in (schema.get("tags") or [])]) if isinstance(schema, dict) else ""
         info = schema.get("info", {}) if isinstance(schema, dict) else {}
@@ -267,7 +276,7 @@ def create_app() -> FastAPI:
         version_val = info.get("version", "")
         meta_text = f"title: {title_val}\nversion: {version_val}\npaths: {paths_len}\ntags: {tags_list}"
         try:
-            raw_json = json.dumps(schema, ensure_ascii=False, indent=2)
+            raw_json = orjson.dumps(schema, option=orjson.OPT_INDENT_2).decode("utf-8")
         except Exception:
             raw_json = str(schema)
         if len(raw_json) > 4000:
@@ -316,7 +325,15 @@ def create_app() -> FastAPI:
             "</body>\n"
             "</html>\n"
         )
-        return HTMLResponse(content=html)
+        body = html.encode("utf-8")
+        app.state.docs_lite_html = (schema, body)
+        return HTMLResponse(content=body)
+
+    # ---- Intern route templates: metric labels become identity hits in the label table ----
+    for route in app.routes:
+        path_format = getattr(route, "path_format", None)
+        if path_format is not None:
+            route.path_format = sys.intern(path_format)
 
     return app
 
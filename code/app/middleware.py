@@ -0,0 +1,122 @@
+from __future__ import annotations
+import sys
+import time
+from urllib.parse import parse_qs
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .ids import uuid4_str
+from .routes.v2_3.observability import HTTP_EVENTS_MAXLEN, http_events, logs as obs_logs, metrics as obs_metrics
+
+# interned method strings; scope["method"] from the server is a fresh str per request
+_INTERNED_METHODS = {m: sys.intern(m) for m in ("GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS", "HEAD")}
+# metric label for requests no route matched (404s, scanners): one series instead of one per raw path
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class ObservabilityMiddleware:
+    """Pure ASGI middleware: trace id propagation + per-request metrics/logs.
+
+    Avoids BaseHTTPMiddleware (``@app.middleware("http")``), which spawns an extra
+    task and materializes Request/Response objects for every request.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_ns = time.perf_counter_ns()
+        method = scope["method"]
+        method = _INTERNED_METHODS.get(method, method)
+        path = scope["path"]
+        status = 500
+        # trace id propagation
+        trace_id = None
+        for k, v in scope.get("headers") or ():
+            if k == b"x-trace-id":
+                trace_id = v.decode("latin-1")
+                break
+        if not trace_id:
+            trace_id = uuid4_str()
+        # single canonical trace id; handlers and error handlers read request.state.trace_id
+        scope.setdefault("state", {})["trace_id"] = trace_id
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                # set trace id header
+                MutableHeaders(scope=message)["x-trace-id"] = trace_id
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:  # record error and re-raise
+            try:
+                obs_logs.add(
+                    "ERROR",
+                    f"Unhandled error: {e}",
+                    module="http",
+                    tags=["exception", method, path, trace_id],
+                    extra={"trace_id": trace_id},
+                )
+            except Exception:
+                pass
+            raise
+        finally:
+            dur_ns = time.perf_counter_ns() - start_ns
+            # matched route template (set by the router) keeps metric label cardinality bounded,
+            # e.g. /rules/{rule_id} instead of one label per rule id; the concrete path goes to the log only
+            route_path = getattr(scope.get("route"), "path_format", UNMATCHED_ROUTE)
+            # raw fields only; metrics/log formatting happens in drain_http_events()
+            # level: 0=INFO, 1=WARN (4xx), 2=ERROR (5xx)
+            if len(http_events) >= HTTP_EVENTS_MAXLEN:
+                # the append below evicts the oldest undrained event
+                obs_metrics.inc("http_events_dropped_total", 1)
+            http_events.append(
+                (method, path, route_path, status, dur_ns, time.time_ns(), trace_id, (status >= 400) + (status >= 500))
+            )
+
+
+class ProfilerMiddleware:
+    """Opt-in pyinstrument profiling: a request with ``?profile=1`` gets its profile as HTML.
+
+    The route still runs normally; its response is discarded in favour of the report.
+    pyinstrument is a development-only dependency (requirements-dev.txt); create_app skips
+    this middleware with a warning when it is not installed.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        from pyinstrument import Profiler
+
+        self.app = app
+        self._profiler_cls = Profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        qs = scope.get("query_string", b"") if scope["type"] == "http" else b""
+        # cheap substring gate before parsing; un-profiled requests pass straight through
+        if b"profile=" not in qs or parse_qs(qs.decode("latin-1")).get("profile", ["0"])[-1] in ("", "0"):
+            await self.app(scope, receive, send)
+            return
+
+        async def discard(message: Message) -> None:
+            pass
+
+        profiler = self._profiler_cls(async_mode="enabled")
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            profiler.stop()
+        body = profiler.output_html().encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"text/html; charset=utf-8"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
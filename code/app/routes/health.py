@@ -1,13 +1,15 @@
-from datetime import datetime, timezone
 from fastapi import APIRouter
+from fastapi.responses import Response
+
+from ..timeutil import iso_now
 
 router = APIRouter()
 
+# static parts of the health body; only the timestamp changes per call
+_HEALTH_PREFIX = b'{"status":"ok","ts":"'
+_HEALTH_SUFFIX = b'","service":"v2.3-api"}'
+
 
 @router.get("/health", tags=["health"]) 
 async def health():
-    return {
-        "status": "ok",
-        "ts": datetime.now(timezone.utc).isoformat(),
-        "service": "v2.3-api",
-    }
\ No newline at end of file
+    return Response(_HEALTH_PREFIX + iso_now().encode() + _HEALTH_SUFFIX, media_type="application/json")
\ No newline at end of file
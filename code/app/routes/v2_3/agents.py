@@ -1,10 +1,11 @@
-from datetime import datetime, timezone
 from typing import List
-from uuid import uuid4
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 from pydantic import BaseModel
 
+from ...ids import uuid4_str
+from ...timeutil import iso_now
+
 # Keep style consistent with other v2.3 routers
 router = APIRouter(prefix="/api/v2.3-preview/agents", tags=["agents"])
 
@@ -26,9 +27,16 @@ class AgentsStatusResponse(BaseModel):
     tasks: List[AgentTask] = []
 
 
+# static parts of the status body (field order matches AgentsStatusResponse);
+# only the check timestamp and the task id change per call
+_STATUS_PREFIX = b'{"status":"idle","health":{"status":"idle","last_check":"'
+_STATUS_MIDDLE = b'"},"tasks":[{"id":"'
+_STATUS_SUFFIX = b'","status":"pending"}]}'
+
+
 # ---- Endpoints ----
-@router.get("/status", response_model=AgentsStatusResponse)
-async def get_agents_status() -> AgentsStatusResponse:
+@router.get("/status", responses={200: {"model": AgentsStatusResponse}})
+async def get_agents_status() -> Response:
     """Return a minimal agents status payload that satisfies tests' enum checks.
     The tests allow 200 or 204. When 200, any field named `status` must be in
     the union of task_statuses and agent_health_statuses. We'll return:
@@ -36,14 +44,8 @@ async def get_agents_status() -> AgentsStatusResponse:
     - health.status: "idle"
     - one task with status: "pending" (task allowed)
     """
-    now = datetime.now(timezone.utc).isoformat()
-
-    # Minimal representative payload
-    health = AgentHealth(status="idle", last_check=now)
-    tasks = [AgentTask(id=str(uuid4()), status="pending")]
-
-    return AgentsStatusResponse(
-        status="idle",
-        health=health,
-        tasks=tasks,
+    # body is spliced from constant bytes
+    return Response(
+        _STATUS_PREFIX + iso_now().encode() + _STATUS_MIDDLE + uuid4_str().encode() + _STATUS_SUFFIX,
+        media_type="application/json",
     )
\ No newline at end of file
@@ -1,10 +1,13 @@
-from datetime import datetime, timezone
-from typing import List, Optional
-from uuid import uuid4
+from array import array
+from typing import Dict, List, Optional
 
 from fastapi import APIRouter, Query, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
+from ...ids import uuid4_str
+from ...timeutil import iso_now
+
 router = APIRouter(prefix="/api/v2.3-preview/cloud", tags=["cloud"])
 
 
@@ -28,48 +31,59 @@ class StatusResponse(BaseModel):
     scopes: List[str]
 
 
-# In-memory consent store keyed by user_id
-_CONSENTS = {}
+# In-memory consent store (structure-of-arrays): user_id -> row index into parallel columns
+_idx: Dict[str, int] = {}
+_ids: List[str] = []
+_scopes: List[List[str]] = []
+_active: array = array("b")
+_ts: List[str] = []
 
 
 @router.post("/consent", response_model=ConsentResponse, status_code=201)
 async def create_consent(req: ConsentRequest):
-    cid = str(uuid4())
-    _CONSENTS[req.user_id] = {
-        "id": cid,
-        "scopes": req.scopes or [],
-        "active": bool(req.consent),
-        "ts": datetime.now(timezone.utc).isoformat(),
-    }
+    cid = uuid4_str()
+    scopes = req.scopes or []
+    ts = iso_now()
+    i = _idx.setdefault(req.user_id, len(_ids))
+    if i == len(_ids):
+        _ids.append(cid)
+        _scopes.append(scopes)
+        _active.append(1 if req.consent else 0)
+        _ts.append(ts)
+    else:
+        _ids[i] = cid
+        _scopes[i] = scopes
+        _active[i] = 1 if req.consent else 0
+        _ts[i] = ts
     return ConsentResponse(
         status="created",
         consent_id=cid,
         user_id=req.user_id,
-        granted_scopes=_CONSENTS[req.user_id]["scopes"],
-        timestamp=_CONSENTS[req.user_id]["ts"],
+        granted_scopes=scopes,
+        timestamp=ts,
     )
 
 
 @router.delete("/consent", response_model=StatusResponse)
 async def revoke_consent(user_id: str = Query(..., description="User ID to revoke consent for")):
-    entry = _CONSENTS.get(user_id)
-    if not entry:
+    i = _idx.get(user_id)
+    if i is None:
         return StatusResponse(status="disconnected", consent_active=False, scopes=[])
-    entry["active"] = False
-    return StatusResponse(status="disconnected", consent_active=False, scopes=entry.get("scopes", []))
+    _active[i] = 0
+    return StatusResponse(status="disconnected", consent_active=False, scopes=_scopes[i])
 
 
-@router.get("/status", response_model=StatusResponse)
+@router.get("/status", responses={200: {"model": StatusResponse}})
 async def consent_status(user_id: Optional[str] = Query(default=None, description="User ID to get consent status for")):
     # When user_id is not provided, align with tests to return 204 No Content
     if not user_id:
         return Response(status_code=204)
-    entry = _CONSENTS.get(user_id)
-    if not entry:
-        return StatusResponse(status="disconnected", consent_active=False, scopes=[])
-    is_active = bool(entry.get("active"))
-    return StatusResponse(
-        status="connected" if is_active else "disconnected",
-        consent_active=is_active,
-        scopes=entry.get("scopes", []),
-    )
\ No newline at end of file
+    i = _idx.get(user_id)
+    if i is None:
+        return ORJSONResponse({"status": "disconnected", "consent_active": False, "scopes": []})
+    is_active = bool(_active[i])
+    return ORJSONResponse({
+        "status": "connected" if is_active else "disconnected",
+        "consent_active": is_active,
+        "scopes": _scopes[i],
+    })
\ No newline at end of file
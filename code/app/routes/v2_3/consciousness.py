@@ -1,10 +1,10 @@
-from datetime import datetime, timezone
-from typing import Optional, Dict, List
+from typing import Any, Optional, Dict, List, Tuple
 
-from fastapi import APIRouter, HTTPException, Request
+import orjson
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel
 from .observability import metrics as obs_metrics, logs as obs_logs
-from uuid import uuid4
+from ...timeutil import iso_now
 
 
 router = APIRouter(prefix="/api/v2.3-preview/consciousness", tags=["consciousness"])
@@ -20,6 +20,9 @@ _ALLOWED_TRANSITIONS: Dict[str, set] = {
     "executing": {"focusing", "sleeping"},
     "sleeping": {"idle"},
 }
+# Transitions are constant: sort once at import instead of per request
+_ALLOWED_NEXT_CACHE: Dict[str, Tuple[str, ...]] = {s: tuple(sorted(v)) for s, v in _ALLOWED_TRANSITIONS.items()}
+_SORTED_ALLOWED_STATES: List[str] = sorted(_ALLOWED_STATES)
 
 # State -> numeric code gauge mapping
 _STATE_CODE_MAP: Dict[str, float] = {
@@ -33,17 +36,47 @@ _STATE_CODE_MAP: Dict[str, float] = {
 # Global runtime state
 _CURRENT_STATE: str = "idle"
 _GOAL_STACK: List[str] = []
-_LAST_UPDATED: datetime = datetime.now(timezone.utc)
+_LAST_UPDATED_ISO: str = iso_now()
+# Serialized /state and /attention bodies; cleared on every mutation and rebuilt on next read
+_BODY_CACHE: Dict[str, bytes] = {}
 
 
-def _allowed_next(state: str) -> List[str]:
-    return sorted(list(_ALLOWED_TRANSITIONS.get(state, set())))
+def _allowed_next(state: str) -> Tuple[str, ...]:
+    return _ALLOWED_NEXT_CACHE.get(state, ())
 
 
 def get_current_state() -> str:
     return _CURRENT_STATE
 
 
+def _attention_payload() -> Dict[str, Any]:
+    # Built from trusted in-process state; serialized once, no Pydantic validation
+    return {
+        "current": _GOAL_STACK[-1] if _GOAL_STACK else None,
+        "stack": _GOAL_STACK,
+        "stack_size": len(_GOAL_STACK),
+        "updated_at": _LAST_UPDATED_ISO,
+    }
+
+
+def _state_payload() -> Dict[str, Any]:
+    return {
+        "state": _CURRENT_STATE,
+        "updated_at": _LAST_UPDATED_ISO,
+        "current_goal": _GOAL_STACK[-1] if _GOAL_STACK else None,
+        "goal_stack": _GOAL_STACK,
+        "allowed_next_states": _allowed_next(_CURRENT_STATE),
+    }
+
+
+def _json_body(key: str) -> Response:
+    body = _BODY_CACHE.get(key)
+    if body is None:
+        body = orjson.dumps(_state_payload() if key == "state" else _attention_payload())
+        _BODY_CACHE[key] = body
+    return Response(content=body, media_type="application/json")
+
+
 # ---- Observability bootstrap ----
 try:
     obs_metrics.set_label("consciousness_state_label", _CURRENT_STATE)
@@ -81,26 +114,21 @@ class AttentionResponse(BaseModel):
 
 
 # ---- Routes ----
-@router.get("/attention", response_model=AttentionResponse)
+@router.get("/attention", responses={200: {"model": AttentionResponse}})
 async def get_attention(request: Request):
     try:
         obs_metrics.inc("attention_get_total", 1)
         obs_metrics.set_gauge("attention_stack_size", float(len(_GOAL_STACK)))
     except Exception:
         pass
-    return AttentionResponse(
-        current=_GOAL_STACK[-1] if _GOAL_STACK else None,
-        stack=list(_GOAL_STACK),
-        stack_size=len(_GOAL_STACK),
-        updated_at=_LAST_UPDATED.isoformat(),
-    )
+    return _json_body("attention")
 
 
-@router.post("/attention", response_model=AttentionResponse)
+@router.post("/attention", responses={200: {"model": AttentionResponse}})
 async def set_attention(req: AttentionRequest, request: Request):
-    global _GOAL_STACK, _LAST_UPDATED
+    global _GOAL_STACK, _LAST_UPDATED_ISO
     mode = (req.mode or "push").lower()
-    trace_id = getattr(request.state, "trace_id", None) or request.headers.get("x-trace-id") or str(uuid4())
+    trace_id = request.state.trace_id
     if mode not in {"push", "replace", "clear"}:
         try:
             obs_metrics.inc("attention_invalid_mode_total", 1)
@@ -117,7 +145,8 @@ async def set_attention(req: AttentionRequest, request: Request):
         if req.target:
             _GOAL_STACK.append(req.target)
 
-    _LAST_UPDATED = datetime.now(timezone.utc)
+    _LAST_UPDATED_ISO = iso_now()
+    _BODY_CACHE.clear()
     try:
         obs_metrics.inc("attention_set_total", 1)
         obs_metrics.set_gauge("attention_stack_size", float(len(_GOAL_STACK)))
@@ -125,35 +154,24 @@ async def set_attention(req: AttentionRequest, request: Request):
     except Exception:
         pass
 
-    return AttentionResponse(
-        current=_GOAL_STACK[-1] if _GOAL_STACK else None,
-        stack=list(_GOAL_STACK),
-        stack_size=len(_GOAL_STACK),
-        updated_at=_LAST_UPDATED.isoformat(),
-    )
+    return _json_body("attention")
 
 
-@router.get("/state", response_model=StateResponse)
+@router.get("/state", responses={200: {"model": StateResponse}})
 async def get_state(request: Request):
     try:
         obs_metrics.inc("consciousness_get_state_total", 1)
     except Exception:
         pass
-    return StateResponse(
-        state=_CURRENT_STATE,
-        updated_at=_LAST_UPDATED.isoformat(),
-        current_goal=_GOAL_STACK[-1] if _GOAL_STACK else None,
-        goal_stack=list(_GOAL_STACK),
-        allowed_next_states=_allowed_next(_CURRENT_STATE),
-    )
+    return _json_body("state")
 
 
-@router.post("/state", response_model=StateResponse)
+@router.post("/state", responses={200: {"model": StateResponse}})
 async def set_state(req: StateRequest, request: Request):
-    global _CURRENT_STATE, _LAST_UPDATED, _GOAL_STACK
+    global _CURRENT_STATE, _LAST_UPDATED_ISO, _GOAL_STACK
 
     new_state = req.state
-    trace_id = getattr(request.state, "trace_id", None) or request.headers.get("x-trace-id") or str(uuid4())
+    trace_id = request.state.trace_id
     if new_state not in _ALLOWED_STATES:
         try:
             obs_metrics.inc("consciousness_invalid_state_total", 1)
@@ -163,7 +181,7 @@ async def set_state(req: StateRequest, request: Request):
         raise HTTPException(status_code=400, detail={
             "message": "invalid state",
             "state": new_state,
-            "allowed_states": sorted(list(_ALLOWED_STATES)),
+            "allowed_states": _SORTED_ALLOWED_STATES,
         })
 
     if not req.force and new_state not in _ALLOWED_TRANSITIONS.get(_CURRENT_STATE, set()):
@@ -181,7 +199,7 @@ async def set_state(req: StateRequest, request: Request):
 
     # State transition
     _CURRENT_STATE = new_state
-    _LAST_UPDATED = datetime.now(timezone.utc)
+    _LAST_UPDATED_ISO = iso_now()
 
     # Optional goal update
     if req.goal is not None:
@@ -189,6 +207,7 @@ async def set_state(req: StateRequest, request: Request):
             _GOAL_STACK.clear()
         else:
             _GOAL_STACK.append(req.goal)
+    _BODY_CACHE.clear()
 
     # Update gauges/labels
     try:
@@ -200,10 +219,4 @@ async def set_state(req: StateRequest, request: Request):
     except Exception:
         pass
 
-    return StateResponse(
-        state=_CURRENT_STATE,
-        updated_at=_LAST_UPDATED.isoformat(),
-        current_goal=_GOAL_STACK[-1] if _GOAL_STACK else None,
-        goal_stack=list(_GOAL_STACK),
-        allowed_next_states=_allowed_next(_CURRENT_STATE),
-    )
\ No newline at end of file
+    return _json_body("state")
\ No newline at end of file
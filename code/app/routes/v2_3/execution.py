@@ -1,6 +1,7 @@
 from typing import Any, Dict
 from pydantic import BaseModel
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 
 router = APIRouter(prefix="/api/v2.3-preview/execution", tags=["execution"])
 
@@ -15,7 +16,7 @@ class ActResponse(BaseModel):
     output: Dict[str, Any]
 
 
-@router.post("/act", response_model=ActResponse)
+@router.post("/act", responses={200: {"model": ActResponse}})
 async def act(req: ActRequest):
     # Echo-style placeholder
-    return ActResponse(success=True, output={"action": req.action, "params": req.params})
\ No newline at end of file
+    return ORJSONResponse({"success": True, "output": {"action": req.action, "params": req.params}})
\ No newline at end of file
@@ -1,13 +1,20 @@
 from __future__ import annotations
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple, Union
 from threading import Lock
-from uuid import uuid4, UUID
+from uuid import UUID
 import hashlib
+import orjson
+import sys
+import heapq
 
-from fastapi import APIRouter, HTTPException, Query, Request, Body
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, HTTPException, Query, Request, Response, Body
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, create_model
 
+from ...ids import uuid4_str
+from ...timeutil import iso_now
 from .observability import metrics as obs_metrics, logs as obs_logs
 
 
@@ -15,25 +22,15 @@ router = APIRouter(prefix="/api/v2.3-preview/experience", tags=["experience"])
 
 
 # ---- Models ----
-class ExperienceRule(BaseModel):
-    id: Optional[str] = None
-    title: str
-    content: str
-    category: Optional[str] = Field(default="general", description="rule category")
-    tags: List[str] = Field(default_factory=list)
-    sources: List[str] = Field(default_factory=list)
-    version: str = "v1"
-    confidence: float = 0.7
-    weight: float = 1.0
-    status: str = Field(default="active", description="active|deprecated|draft")
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
-    fingerprint: Optional[str] = None
+class _RuleOps:
+    """Behaviour shared by the ExperienceRule model and its in-store ExperienceRuleCore form."""
+
+    __slots__ = ()
 
     def ensure_ids(self) -> None:
         if not self.id:
-            self.id = str(uuid4())
-        now = datetime.now(timezone.utc).isoformat()
+            self.id = uuid4_str()
+        now = iso_now()
         if not self.created_at:
             self.created_at = now
         self.updated_at = now
@@ -57,6 +54,22 @@ class ExperienceRule(BaseModel):
             "fp": self.fingerprint,
         }
 
+
+class ExperienceRule(_RuleOps, BaseModel):
+    id: Optional[str] = None
+    title: str
+    content: str
+    category: Optional[str] = Field(default="general", description="rule category")
+    tags: List[str] = Field(default_factory=list)
+    sources: List[str] = Field(default_factory=list)
+    version: str = "v1"
+    confidence: float = 0.7
+    weight: float = 1.0
+    status: str = Field(default="active", description="active|deprecated|draft")
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    fingerprint: Optional[str] = None
+
     @staticmethod
     def from_compact(d: Dict[str, Any]) -> "ExperienceRule":
         return ExperienceRule(
@@ -76,6 +89,50 @@ class ExperienceRule(BaseModel):
         )
 
 
+@dataclass(slots=True)
+class ExperienceRuleCore(_RuleOps):
+    """In-store form of ExperienceRule: same fields, no pydantic validation on copy/update.
+
+    ExperienceRule stays the API/snapshot boundary model; FastAPI validates returned cores
+    against it via response_model. Field order matches the model (full export serializes cores directly).
+    """
+
+    id: Optional[str] = None
+    title: str = ""
+    content: str = ""
+    category: Optional[str] = "general"
+    tags: List[str] = field(default_factory=list)
+    sources: List[str] = field(default_factory=list)
+    version: str = "v1"
+    confidence: float = 0.7
+    weight: float = 1.0
+    status: str = "active"
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    fingerprint: Optional[str] = None
+
+    @staticmethod
+    def from_model(rule: ExperienceRule) -> "ExperienceRuleCore":
+        # a validated model's __dict__ holds exactly the declared fields
+        core = ExperienceRuleCore(**rule.__dict__)
+        core.intern_labels()
+        return core
+
+    def intern_labels(self) -> None:
+        # status/category come from a tiny closed set; share one string object per value
+        if self.status:
+            self.status = sys.intern(self.status)
+        if self.category:
+            self.category = sys.intern(self.category)
+
+
+# validates only the keys a PUT patch actually carries (all fields optional)
+_RulePatch = create_model(
+    "_RulePatch",
+    **{name: (Optional[f.annotation], None) for name, f in ExperienceRule.model_fields.items()},
+)
+
+
 class SearchResponse(BaseModel):
     count: int
     returned: int
@@ -91,52 +148,142 @@ class ImportRequest(BaseModel):
 
 
 # ---- In-memory Store (thread-safe) ----
+@lru_cache(maxsize=4096)
+def _fingerprint_cached(title: str, content: str) -> str:
+    # repeated submissions (dedup retries, re-imports) skip the SHA-256 work
+    base = title.strip().lower() + "\n" + content.strip().lower()
+    return hashlib.sha256(base.encode("utf-8")).hexdigest()
+
+
+def _lc(s: Optional[str]) -> str:
+    # str.lower() always allocates; already-lowercase values (the common case) are returned as-is
+    if not s:
+        return ""
+    return s if s.islower() else s.lower()
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
 class ExperienceStore:
     def __init__(self) -> None:
-        self._by_id: Dict[str, ExperienceRule] = {}
+        self._by_id: Dict[str, ExperienceRuleCore] = {}
         self._id_by_fp: Dict[str, str] = {}
         self._lock = Lock()
+        # search indexes, maintained under _lock by _index/_unindex
+        # lowered keys per rule id, computed once at insert/update: (title, content, tags, category, status)
+        self._text_by_id: Dict[str, Tuple[str, str, FrozenSet[str], str, str]] = {}
+        # trigram of lowered title/content -> rule ids (candidate superset for substring q)
+        self._gram_index: Dict[str, Set[str]] = {}
+        self._cat_index: Dict[str, Set[str]] = {}
+        self._tag_index: Dict[str, Set[str]] = {}
+        self._status_index: Dict[str, Set[str]] = {}
+        # insertion sequence per id, mirrors _by_id order for stable tie-breaking
+        self._seq_by_id: Dict[str, int] = {}
+        self._next_seq = 0
+        # copy-on-write view for list_all(): published lazily, dropped (set to None) by every write
+        self._all_snapshot: Optional[Tuple[ExperienceRuleCore, ...]] = ()
+
+    def _index(self, rule: ExperienceRuleCore) -> None:
+        rid = rule.id
+        title_l = _lc(rule.title)
+        content_l = _lc(rule.content)
+        cat_l = sys.intern(_lc(rule.category))
+        status_l = sys.intern(_lc(rule.status))
+        tags_l = frozenset(sys.intern(_lc(t)) for t in (rule.tags or []))
+        self._text_by_id[rid] = (title_l, content_l, tags_l, cat_l, status_l)
+        for g in _trigrams(title_l) | _trigrams(content_l):
+            self._gram_index.setdefault(g, set()).add(rid)
+        for t in tags_l:
+            self._tag_index.setdefault(t, set()).add(rid)
+        self._cat_index.setdefault(cat_l, set()).add(rid)
+        self._status_index.setdefault(status_l, set()).add(rid)
+        if rid not in self._seq_by_id:
+            self._seq_by_id[rid] = self._next_seq
+            self._next_seq += 1
+
+    def _unindex(self, rule: ExperienceRuleCore, *, keep_seq: bool = False) -> None:
+        rid = rule.id
+        texts = self._text_by_id.pop(rid, None)
+        if texts:
+            title_l, content_l, tags_l, cat_l, status_l = texts
+            for g in _trigrams(title_l) | _trigrams(content_l):
+                ids = self._gram_index.get(g)
+                if ids is not None:
+                    ids.discard(rid)
+                    if not ids:
+                        del self._gram_index[g]
+            keyed = [(self._cat_index, cat_l), (self._status_index, status_l)]
+            keyed.extend((self._tag_index, t) for t in tags_l)
+            for index, key in keyed:
+                ids = index.get(key)
+                if ids is not None:
+                    ids.discard(rid)
+                    if not ids:
+                        del index[key]
+        if not keep_seq:
+            self._seq_by_id.pop(rid, None)
 
     @staticmethod
     def make_fingerprint(title: str, content: str) -> str:
-        base = (title or "").strip().lower() + "\n" + (content or "").strip().lower()
-        return hashlib.sha256(base.encode("utf-8")).hexdigest()
+        return _fingerprint_cached(title or "", content or "")
 
     def stats(self) -> Tuple[int, int]:
-        with self._lock:
-            return len(self._by_id), len(self._id_by_fp)
+        # len() of a dict is atomic; readers do not queue behind writers
+        return len(self._by_id), len(self._id_by_fp)
 
-    def add(self, rule: ExperienceRule, *, dedup: bool = True, upsert: bool = False) -> ExperienceRule:
+    def add(self, rule: Union[ExperienceRule, ExperienceRuleCore], *, dedup: bool = True, upsert: bool = False) -> ExperienceRuleCore:
         with self._lock:
-            rule.ensure_ids()
-            fp = rule.fingerprint or self.make_fingerprint(rule.title, rule.content)
-            if dedup and fp in self._id_by_fp:
+            return self._add_locked(rule, dedup=dedup, upsert=upsert)[0]
+
+    def _add_locked(self, rule: Union[ExperienceRule, ExperienceRuleCore], *, dedup: bool, upsert: bool) -> Tuple[ExperienceRuleCore, bool]:
+        """Insert under an already-held lock; the flag is False when dedup returned an existing rule."""
+        if isinstance(rule, ExperienceRule):
+            rule = ExperienceRuleCore.from_model(rule)
+        rule.ensure_ids()
+        fp = rule.fingerprint or self.make_fingerprint(rule.title, rule.content)
+        if dedup:
+            ex_id = self._id_by_fp.get(fp)
+            if ex_id is not None:
                 # return existing
-                ex_id = self._id_by_fp[fp]
-                return self._by_id[ex_id]
-            if upsert and rule.id in self._by_id:
-                # update existing by id
-                old = self._by_id[rule.id]
-                rule.created_at = old.created_at or rule.created_at
-            self._by_id[rule.id] = rule
-            self._id_by_fp[fp] = rule.id
-            return rule
-
-    def get(self, id: str) -> Optional[ExperienceRule]:
-        with self._lock:
-            return self._by_id.get(id)
-
-    def update(self, id: str, patch: Dict[str, Any]) -> ExperienceRule:
+                return self._by_id[ex_id], False
+        old = self._by_id.get(rule.id)
+        if upsert and old is not None:
+            # update existing by id
+            rule.created_at = old.created_at or rule.created_at
+        if old is not None:
+            self._unindex(old, keep_seq=True)
+        self._by_id[rule.id] = rule
+        self._all_snapshot = None
+        self._id_by_fp[fp] = rule.id
+        self._index(rule)
+        return rule, True
+
+    def get(self, id: str) -> Optional[ExperienceRuleCore]:
+        # single dict lookup is atomic; stored rules are replaced, never mutated in place
+        return self._by_id.get(id)
+
+    def update(self, id: str, patch: Dict[str, Any]) -> ExperienceRuleCore:
         with self._lock:
             cur = self._by_id.get(id)
             if not cur:
                 raise KeyError("not_found")
-            data = cur.model_dump()
-            data.update({k: v for k, v in patch.items() if v is not None})
-            upd = ExperienceRule(**data)
-            upd.updated_at = datetime.now(timezone.utc).isoformat()
-            upd.fingerprint = self.make_fingerprint(upd.title, upd.content)
+            # validate just the patched values (unknown keys are ignored, as before); a missing
+            # rule is reported first, whatever the patch holds
+            changes = _RulePatch.model_validate({k: v for k, v in patch.items() if v is not None}).model_dump(exclude_none=True)
+            upd = replace(cur, **changes)
+            upd.intern_labels()
+            upd.updated_at = iso_now()
+            if cur.fingerprint and upd.title == cur.title and upd.content == cur.content:
+                # status/tag/weight patches (approve/reject etc.) keep the same fingerprint; skip re-hashing
+                upd.fingerprint = cur.fingerprint
+            else:
+                upd.fingerprint = self.make_fingerprint(upd.title, upd.content)
+            self._unindex(cur, keep_seq=True)
             self._by_id[id] = upd
+            self._all_snapshot = None
+            self._index(upd)
             self._id_by_fp[upd.fingerprint] = id
             return upd
 
@@ -145,6 +292,8 @@ class ExperienceStore:
             cur = self._by_id.pop(id, None)
             if not cur:
                 return False
+            self._all_snapshot = None
+            self._unindex(cur)
             # best-effort remove fp index
             try:
                 fp = cur.fingerprint or self.make_fingerprint(cur.title, cur.content)
@@ -154,9 +303,18 @@ class ExperienceStore:
                 pass
             return True
 
-    def list_all(self) -> List[ExperienceRule]:
-        with self._lock:
-            return list(self._by_id.values())
+    def list_all(self) -> List[ExperienceRuleCore]:
+        snap = self._all_snapshot
+        if snap is None:
+            with self._lock:
+                snap = self._all_snapshot
+                if snap is None:
+                    snap = self._all_snapshot = tuple(self._by_id.values())
+        return list(snap)
+
+    def count_by_status(self, status: str) -> int:
+        # O(1) from the status index (kept current by every write); like stats(), no lock needed
+        return len(self._status_index.get(_lc(status), ()))
 
     def search(
         self,
@@ -166,51 +324,84 @@ class ExperienceStore:
         category: Optional[str] = None,
         status: Optional[str] = None,
         limit: int = 50,
-    ) -> List[ExperienceRule]:
-        ql = (q or "").strip().lower()
-        tagl = (tag or "").strip().lower()
-        catl = (category or "").strip().lower()
-        stl = (status or "").strip().lower()
-        res: List[Tuple[float, ExperienceRule]] = []
+    ) -> List[ExperienceRuleCore]:
+        ql = _lc((q or "").strip())
+        tagl = _lc((tag or "").strip())
+        catl = _lc((category or "").strip())
+        stl = _lc((status or "").strip())
+        k = max(1, min(limit, 200))
+        # bounded min-heap of the best k: (score, -seq, rule); heap[0] is the current worst kept
+        heap: List[Tuple[float, int, ExperienceRuleCore]] = []
         with self._lock:
-            for r in self._by_id.values():
-                if catl and (r.category or "").lower() != catl:
-                    continue
-                if stl and (r.status or "").lower() != stl:
-                    continue
-                if tagl and tagl not in ",".join([t.lower() for t in (r.tags or [])]):
+            # narrow to a candidate id set via the indexes; q shorter than a trigram scans everything
+            sets: List[Set[str]] = []
+            if catl:
+                sets.append(self._cat_index.get(catl) or set())
+            if tagl:
+                # exact (case-insensitive) tag match
+                sets.append(self._tag_index.get(tagl) or set())
+            if stl:
+                sets.append(self._status_index.get(stl) or set())
+            if len(ql) >= 3:
+                sets.extend(self._gram_index.get(g) or set() for g in _trigrams(ql))
+            if sets:
+                sets.sort(key=len)
+                candidates = set(sets[0]).intersection(*sets[1:])
+            else:
+                candidates = self._by_id.keys()
+            # best attainable text bonus; with a full heap, rules whose upper bound cannot beat
+            # the current minimum are dropped before any substring checks
+            text_bonus = 3.0 if ql else 0.0
+            for rid in candidates:
+                r = self._by_id[rid]
+                base = (r.confidence or 0.0) * 0.5 + (r.weight or 0.0) * 0.5
+                if len(heap) == k and text_bonus + base < heap[0][0]:
                     continue
+                title_l, content_l, _, _, _ = self._text_by_id[rid]
                 score = 0.0
                 if ql:
-                    in_title = ql in (r.title or "").lower()
-                    in_content = ql in (r.content or "").lower()
+                    # trigram hits are a superset; confirm the actual substring match
+                    in_title = ql in title_l
+                    in_content = ql in content_l
                     if not (in_title or in_content):
                         continue
                     score += 2.0 if in_title else 0.0
                     score += 1.0 if in_content else 0.0
-                score += (r.confidence or 0.0) * 0.5 + (r.weight or 0.0) * 0.5
-                res.append((score, r))
-        res.sort(key=lambda x: x[0], reverse=True)
-        return [r for _, r in res[: max(1, min(limit, 200))]]
-
-    def import_items(self, items: List[ExperienceRule], *, upsert: bool = True, dedup: bool = True) -> Tuple[int, int]:
+                score += base
+                entry = (score, -self._seq_by_id[rid], r)
+                if len(heap) < k:
+                    heapq.heappush(heap, entry)
+                elif entry[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, entry)
+        # best score first; equal scores keep insertion order (seq is unique, rules never compared)
+        heap.sort(key=lambda x: (x[0], x[1]), reverse=True)
+        return [r for _, _, r in heap]
+
+    def import_items(self, items: List[Union[ExperienceRule, ExperienceRuleCore]], *, upsert: bool = True, dedup: bool = True) -> Tuple[int, int]:
         ok = 0
         dup = 0
-        for it in items:
-            before_cnt, _ = self.stats()
-            existed = False
-            try:
-                added = self.add(it, dedup=dedup, upsert=upsert)
-                after_cnt, _ = self.stats()
-                existed = before_cnt == after_cnt and added.id not in (it.id or "")
-                ok += 1
-            except Exception:
-                dup += 1
+        # one lock acquisition for the whole batch; in-batch duplicates hit _id_by_fp like any other
+        with self._lock:
+            for it in items:
+                try:
+                    _, inserted = self._add_locked(it, dedup=dedup, upsert=upsert)
+                except Exception:
+                    dup += 1
+                    continue
+                if inserted:
+                    ok += 1
+                else:
+                    dup += 1
         return ok, dup
 
 
 store = ExperienceStore()
 
+# rule/candidate gauges read the store's O(1) counts at metrics-read time instead of being
+# recomputed on every mutating request
+obs_metrics.register_gauge("experience_rules_total", lambda: store.stats()[0])
+obs_metrics.register_gauge("experience_candidates_total", lambda: store.count_by_status("draft"))
+
 
 # ---- Routes ----
 @router.post("/rules", response_model=ExperienceRule)
@@ -220,7 +411,7 @@ async def add_rule(
     dedup: bool = Query(default=True),
     upsert: bool = Query(default=False),
 ):
-    trace_id = getattr(request.state, "trace_id", None) or request.headers.get("x-trace-id") or str(uuid4())
+    trace_id = request.state.trace_id
     try:
         # Compatibility mapping: allow legacy payloads with name/condition/action keys
         data = payload or {}
@@ -255,9 +446,7 @@ async def add_rule(
             status=status,
         )
         added = store.add(rule, dedup=dedup, upsert=upsert)
-        cnt, _ = store.stats()
         obs_metrics.inc("experience_rule_added_total", 1)
-        obs_metrics.set_gauge("experience_rules_total", float(cnt))
         obs_logs.add("INFO", f"rule added {added.id}", module="experience", tags=["add", trace_id], extra={"trace_id": trace_id, "rule_id": added.id})
         return added
     except Exception as e:
@@ -267,11 +456,12 @@ async def add_rule(
 
 @router.get("/rules/{rule_id:uuid}", response_model=ExperienceRule)
 async def get_rule(rule_id: UUID, request: Request):
-    trace_id = getattr(request.state, "trace_id", None) or request.headers.get("x-trace-id") or str(uuid4())
-    r = store.get(str(rule_id))
+    trace_id = request.state.trace_id
+    rid = str(rule_id)  # single UUID -> str conversion; store keys are strings
+    r = store.get(rid)
     if not r:
-        obs_logs.add("WARN", "rule not found", module="experience", tags=[str(rule_id), trace_id], extra={"trace_id": trace_id})
-        raise HTTPException(status_code=404, detail={"message": "not_found", "id": str(rule_id)})
+        obs_logs.add("WARN", "rule not found", module="experience", tags=[rid, trace_id], extra={"trace_id": trace_id})
+        raise HTTPException(status_code=404, detail={"message": "not_found", "id": rid})
     try:
         obs_metrics.inc("experience_rule_get_total", 1)
     except Exception:
@@ -281,15 +471,16 @@ async def get_rule(rule_id: UUID, request: Request):
 
 @router.put("/rules/{rule_id:uuid}", response_model=ExperienceRule)
 async def update_rule(rule_id: UUID, patch: Dict[str, Any], request: Request):
-    trace_id = getattr(request.state, "trace_id", None) or request.headers.get("x-trace-id") or str(uuid4())
+    trace_id = request.state.trace_id
+    rid = str(rule_id)
     try:
-        upd = store.update(str(rule_id), patch)
+        upd = store.update(rid, patch)
         obs_metrics.inc("experience_rule_updated_total", 1)
-        obs_logs.add("INFO", f"rule updated {rule_id}", module="experience", tags=["update", trace_id], extra={"trace_id": trace_id})
+        obs_logs.add("INFO", f"rule updated {rid}", module="experience", tags=["update", trace_id], extra={"trace_id": trace_id})
         return upd
     except KeyError:
-        obs_logs.add("WARN", "rule not found for update", module="experience", tags=[str(rule_id), trace_id], extra={"trace_id": trace_id})
-        raise HTTPException(status_code=404, detail={"message": "not_found", "id": str(rule_id)})
+        obs_logs.add("WARN", "rule not found for update", module="experience", tags=[rid, trace_id], extra={"trace_id": trace_id})
+        raise HTTPException(status_code=404, detail={"message": "not_found", "id": rid})
     except Exception as e:
         obs_logs.add("ERROR", f"update rule failed: {e}", module="experience", tags=["exception", trace_id], extra={"trace_id": trace_id})
         raise HTTPException(status_code=500, detail={"message": "update_failed"})
@@ -297,42 +488,29 @@ async def update_rule(rule_id: UUID, patch: Dict[str, Any], request: Request):
 
 @router.delete("/rules/{rule_id:uuid}")
 async def delete_rule(rule_id: UUID, request: Request):
-    trace_id = getattr(request.state, "trace_id", None) or request.headers.get("x-trace-id") or str(uuid4())
-    ok = store.delete(str(rule_id))
+    trace_id = request.state.trace_id
+    rid = str(rule_id)
+    ok = store.delete(rid)
     if not ok:
-        obs_logs.add("WARN", "rule not found for delete", module="experience", tags=[str(rule_id), trace_id], extra={"trace_id": trace_id})
-        raise HTTPException(status_code=404, detail={"message": "not_found", "id": str(rule_id)})
-    cnt, _ = store.stats()
-    # refresh candidate (draft) gauge after deletion
-    cand_cnt = sum(1 for r in store.list_all() if (r.status or "").lower() == "draft")
+        obs_logs.add("WARN", "rule not found for delete", module="experience", tags=[rid, trace_id], extra={"trace_id": trace_id})
+        raise HTTPException(status_code=404, detail={"message": "not_found", "id": rid})
     try:
         obs_metrics.inc("experience_rule_deleted_total", 1)
-        obs_metrics.set_gauge("experience_rules_total", float(cnt))
     except Exception:
         pass
-    try:
-        obs_metrics.set_gauge("experience_candidates_total", float(cand_cnt))
-    except Exception:
-        pass
-    obs_logs.add("INFO", f"rule deleted {rule_id}", module="experience", tags=["delete", trace_id], extra={"trace_id": trace_id})
-    return {"status": "deleted", "id": str(rule_id)}
+    obs_logs.add("INFO", f"rule deleted {rid}", module="experience", tags=["delete", trace_id], extra={"trace_id": trace_id})
+    return {"status": "deleted", "id": rid}
 
 
 # ---- Candidate queue + human review (P1 minimal loop) ----
 @router.post("/candidates", response_model=ExperienceRule)
 async def add_candidate(req: ExperienceRule, request: Request, dedup: bool = Query(default=False), upsert: bool = Query(default=False)):
-    trace_id = getattr(request.state, "trace_id", None) or request.headers.get("x-trace-id") or str(uuid4())
+    trace_id = request.state.trace_id
     try:
         # force candidate status to draft for human review
         req.status = "draft"
         added = store.add(req, dedup=dedup, upsert=upsert)
-        # compute candidate count (draft)
-        cand_cnt = sum(1 for r in store.list_all() if (r.status or "").lower() == "draft")
         obs_metrics.inc("experience_candidate_added_total", 1)
-        try:
-            obs_metrics.set_gauge("experience_candidates_total", float(cand_cnt))
-        except Exception:
-            pass
         obs_logs.add(
             "INFO",
             f"candidate added {added.id}",
@@ -346,7 +524,17 @@ async def add_candidate(req: ExperienceRule, request: Request, dedup: bool = Que
         raise HTTPException(status_code=500, detail={"message": "candidate_add_failed"})
 
 
-@router.get("/candidates", response_model=SearchResponse)
+def _search_response(items: List[ExperienceRuleCore]) -> ORJSONResponse:
+    # store cores already have the SearchResponse item shape; orjson encodes the dataclasses directly
+    return ORJSONResponse({
+        "count": len(items),
+        "returned": len(items),
+        "items": items,
+        "updated_at": iso_now(),
+    })
+
+
+@router.get("/candidates", responses={200: {"model": SearchResponse}})
 async def list_candidates(
     request: Request,
     q: Optional[str] = Query(default=None),
@@ -354,7 +542,7 @@ async def list_candidates(
     category: Optional[str] = Query(default=None),
     limit: int = Query(default=50, ge=1, le=200),
 ):
-    trace_id = getattr(request.state, "trace_id", None) or request.headers.get("x-trace-id") or str(uuid4())
+    trace_id = request.state.trace_id
     items = store.search(q=q, tag=tag, category=category, status="draft", limit=limit)
     try:
         obs_metrics.inc("experience_candidate_search_total", 1)
@@ -367,37 +555,27 @@ async def list_candidates(
         )
     except Exception:
         pass
-    return SearchResponse(
-        count=len(items),
-        returned=len(items),
-        items=items,
-        updated_at=datetime.now(timezone.utc).isoformat(),
-    )
+    return _search_response(items)
 
 
 @router.post("/candidates/{rule_id:uuid}/approve", response_model=ExperienceRule)
 async def approve_candidate(rule_id: UUID, request: Request):
-    trace_id = getattr(request.state, "trace_id", None) or request.headers.get("x-trace-id") or str(uuid4())
+    trace_id = request.state.trace_id
+    rid = str(rule_id)
     try:
-        upd = store.update(str(rule_id), {"status": "active"})
-        # refresh candidate gauge
-        cand_cnt = sum(1 for r in store.list_all() if (r.status or "").lower() == "draft")
+        upd = store.update(rid, {"status": "active"})
         obs_metrics.inc("experience_candidate_approved_total", 1)
-        try:
-            obs_metrics.set_gauge("experience_candidates_total", float(cand_cnt))
-        except Exception:
-            pass
         obs_logs.add(
             "INFO",
-            f"candidate approved {rule_id}",
+            f"candidate approved {rid}",
             module="experience",
             tags=["approve", trace_id],
-            extra={"trace_id": trace_id, "rule_id": str(rule_id)},
+            extra={"trace_id": trace_id, "rule_id": rid},
         )
         return upd
     except KeyError:
-        obs_logs.add("WARN", "candidate not found for approve", module="experience", tags=[str(rule_id), trace_id], extra={"trace_id": trace_id})
-        raise HTTPException(status_code=404, detail={"message": "not_found", "id": str(rule_id)})
+        obs_logs.add("WARN", "candidate not found for approve", module="experience", tags=[rid, trace_id], extra={"trace_id": trace_id})
+        raise HTTPException(status_code=404, detail={"message": "not_found", "id": rid})
     except Exception as e:
         obs_logs.add("ERROR", f"approve candidate failed: {e}", module="experience", tags=["exception", trace_id], extra={"trace_id": trace_id})
         raise HTTPException(status_code=500, detail={"message": "candidate_approve_failed"})
@@ -405,32 +583,28 @@ async def approve_candidate(rule_id: UUID, request: Request):
 
 @router.post("/candidates/{rule_id:uuid}/reject", response_model=ExperienceRule)
 async def reject_candidate(rule_id: UUID, request: Request, reason: Optional[str] = Query(default=None)):
-    trace_id = getattr(request.state, "trace_id", None) or request.headers.get("x-trace-id") or str(uuid4())
+    trace_id = request.state.trace_id
+    rid = str(rule_id)
     try:
-        upd = store.update(str(rule_id), {"status": "deprecated"})
-        cand_cnt = sum(1 for r in store.list_all() if (r.status or "").lower() == "draft")
+        upd = store.update(rid, {"status": "deprecated"})
         obs_metrics.inc("experience_candidate_rejected_total", 1)
-        try:
-            obs_metrics.set_gauge("experience_candidates_total", float(cand_cnt))
-        except Exception:
-            pass
         obs_logs.add(
             "INFO",
-            f"candidate rejected {rule_id}",
+            f"candidate rejected {rid}",
             module="experience",
             tags=["reject", (reason or ""), trace_id],
-            extra={"trace_id": trace_id, "rule_id": str(rule_id), "reason": reason or ""},
+            extra={"trace_id": trace_id, "rule_id": rid, "reason": reason or ""},
         )
         return upd
     except KeyError:
-        obs_logs.add("WARN", "candidate not found for reject", module="experience", tags=[str(rule_id), trace_id], extra={"trace_id": trace_id})
-        raise HTTPException(status_code=404, detail={"message": "not_found", "id": str(rule_id)})
+        obs_logs.add("WARN", "candidate not found for reject", module="experience", tags=[rid, trace_id], extra={"trace_id": trace_id})
+        raise HTTPException(status_code=404, detail={"message": "not_found", "id": rid})
     except Exception as e:
         obs_logs.add("ERROR", f"reject candidate failed: {e}", module="experience", tags=["exception", trace_id], extra={"trace_id": trace_id})
         raise HTTPException(status_code=500, detail={"message": "candidate_reject_failed"})
 
 
-@router.get("/rules/search", response_model=SearchResponse)
+@router.get("/rules/search", responses={200: {"model": SearchResponse}})
 async def search_rules(
     request: Request,
     q: Optional[str] = Query(default=None),
@@ -439,43 +613,41 @@ async def search_rules(
     status: Optional[str] = Query(default=None),
     limit: int = Query(default=50, ge=1, le=200),
 ):
-    trace_id = getattr(request.state, "trace_id", None) or request.headers.get("x-trace-id") or str(uuid4())
+    trace_id = request.state.trace_id
     items = store.search(q=q, tag=tag, category=category, status=status, limit=limit)
     try:
         obs_metrics.inc("experience_search_total", 1)
         obs_logs.add("INFO", "experience search", module="experience", tags=[q or "", tag or "", category or "", trace_id], extra={"trace_id": trace_id, "returned": len(items)})
     except Exception:
         pass
-    return SearchResponse(
-        count=len(items),
-        returned=len(items),
-        items=items,
-        updated_at=datetime.now(timezone.utc).isoformat(),
-    )
+    return _search_response(items)
 
 
 @router.get("/snapshot/export")
 async def export_snapshot(request: Request, compact: bool = Query(default=True)):
-    trace_id = getattr(request.state, "trace_id", None) or request.headers.get("x-trace-id") or str(uuid4())
+    trace_id = request.state.trace_id
     items = store.list_all()
     if compact:
         payload = [it.to_compact() for it in items]
         mode = "compact"
     else:
-        payload = [it.model_dump() for it in items]
+        # orjson serializes the slotted dataclasses natively; no asdict() copies
+        payload = items
         mode = "full"
     obs_logs.add("INFO", f"snapshot export {mode}", module="experience", tags=[mode, trace_id], extra={"trace_id": trace_id, "count": len(items)})
-    return {
+    # whole payload encoded in one orjson call, skipping jsonable_encoder's per-value walk
+    body = orjson.dumps({
         "count": len(items),
         "mode": mode,
         "items": payload,
-        "updated_at": datetime.now(timezone.utc).isoformat(),
-    }
+        "updated_at": iso_now(),
+    })
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/snapshot/import")
 async def import_snapshot(req: ImportRequest, request: Request):
-    trace_id = getattr(request.state, "trace_id", None) or request.headers.get("x-trace-id") or str(uuid4())
+    trace_id = request.state.trace_id
     items: List[ExperienceRule] = []
     if req.items_compact:
         for it in req.items_compact:
@@ -486,16 +658,9 @@ async def import_snapshot(req: ImportRequest, request: Request):
         raise HTTPException(status_code=400, detail={"message": "no_items"})
     ok, dup = store.import_items(items, upsert=req.upsert, dedup=req.dedup)
     cnt, _ = store.stats()
-    # compute current draft candidates after import
-    cand_cnt = sum(1 for r in store.list_all() if (r.status or "").lower() == "draft")
     try:
         obs_metrics.inc("experience_import_total", 1)
-        obs_metrics.set_gauge("experience_rules_total", float(cnt))
         obs_logs.add("INFO", "snapshot import", module="experience", tags=[str(ok), str(dup), trace_id], extra={"trace_id": trace_id, "ok": ok, "dup": dup})
     except Exception:
         pass
-    try:
-        obs_metrics.set_gauge("experience_candidates_total", float(cand_cnt))
-    except Exception:
-        pass
     return {"imported": ok, "duplicates": dup, "total": cnt}
\ No newline at end of file
@@ -1,23 +1,34 @@
-from datetime import datetime, timedelta, timezone
+import time
 from typing import Any, Dict, List, Optional
-from uuid import uuid4
 
 from fastapi import APIRouter, Query, HTTPException, Request
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field
+from ...ids import uuid4_str
+from ...timeutil import iso_from_ns_uncached, iso_now
 from .observability import metrics as obs_metrics, logs as obs_logs
 from .consciousness import get_current_state
 
 router = APIRouter(prefix="/api/v2.3-preview/memory", tags=["memory"]) 
 
+_EXPORT_TTL_NS = 3600 * 1_000_000_000
+
 
 class MemoryItem(BaseModel):
+    # sync items are not validated per element; every field is optional and extra keys are kept
+    model_config = ConfigDict(extra="allow")
+
     id: Optional[str] = None
-    content: Dict[str, Any]
+    content: Optional[Dict[str, Any]] = None
 
 
 class MemorySyncRequest(BaseModel):
     # make items optional to be compatible with tests that send only {force, timeout}
-    items: List[MemoryItem] = Field(default_factory=list)
+    # raw dicts: the handler only counts items, so a MemoryItem model per element is pure overhead
+    items: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        json_schema_extra={"items": MemoryItem.model_json_schema()},
+    )
     # optional control flags accepted by tests/tools; ignored by current implementation
     force: Optional[bool] = False
     timeout: Optional[int] = 30
@@ -43,9 +54,9 @@ class MemoryExportRequest(BaseModel):
 
 @router.post("/sync", response_model=MemorySyncResponse)
 async def memory_sync(req: MemorySyncRequest, request: Request):
-    # derive or generate a trace id for this sync attempt and start timer
-    trace_id = request.headers.get("x-trace-id") or str(uuid4())
-    start_ts = datetime.now(timezone.utc)
+    # trace id is assigned by ObservabilityMiddleware; start timer
+    trace_id = request.state.trace_id
+    start_ns = time.perf_counter_ns()
 
     # minimal memory gating: deny when sleeping
     state = get_current_state()
@@ -59,7 +70,7 @@ async def memory_sync(req: MemorySyncRequest, request: Request):
 
     synced = len(req.items)
     failed = 0
-    elapsed_ms = (datetime.now(timezone.utc) - start_ts).total_seconds() * 1000.0
+    elapsed_ms = (time.perf_counter_ns() - start_ns) / 1_000_000.0
     try:
         obs_metrics.inc("memory_sync_total", 1)
         obs_metrics.inc("memory_items_synced_total", synced)
@@ -71,33 +82,33 @@ async def memory_sync(req: MemorySyncRequest, request: Request):
         synced_count=synced,
         failed_count=failed,
         trace_id=trace_id,
-        finished_at=datetime.now(timezone.utc).isoformat(),
+        finished_at=iso_now(),
     )
 
 
-@router.get("/export", response_model=MemoryExportResponse)
+@router.get("/export", responses={200: {"model": MemoryExportResponse}})
 async def memory_export():
-    expires = datetime.now(timezone.utc) + timedelta(hours=1)
+    expires_ns = time.time_ns() + _EXPORT_TTL_NS
     try:
         obs_metrics.inc("memory_export_total", 1)
     except Exception:
         pass
-    return MemoryExportResponse(
-        export_url=f"/downloads/memory/export-{uuid4()}.json",
-        expires_at=expires.isoformat(),
-    )
+    return ORJSONResponse({
+        "export_url": f"/downloads/memory/export-{uuid4_str()}.json",
+        "expires_at": iso_from_ns_uncached(expires_ns),
+    })
 
 
 # New: POST variant for compatibility with tests expecting POST body
-@router.post("/export", response_model=MemoryExportResponse)
+@router.post("/export", responses={200: {"model": MemoryExportResponse}})
 async def memory_export_post(_: MemoryExportRequest):
     # Behavior mirrors GET /export; request body is accepted for compatibility
-    expires = datetime.now(timezone.utc) + timedelta(hours=1)
+    expires_ns = time.time_ns() + _EXPORT_TTL_NS
     try:
         obs_metrics.inc("memory_export_total", 1)
     except Exception:
         pass
-    return MemoryExportResponse(
-        export_url=f"/downloads/memory/export-{uuid4()}.json",
-        expires_at=expires.isoformat(),
-    )
\ No newline at end of file
+    return ORJSONResponse({
+        "export_url": f"/downloads/memory/export-{uuid4_str()}.json",
+        "expires_at": iso_from_ns_uncached(expires_ns),
+    })
\ No newline at end of file
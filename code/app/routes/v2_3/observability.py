@@ -1,90 +1,265 @@
 from __future__ import annotations
-from collections import deque
-from datetime import datetime, timedelta, timezone
-from statistics import mean
-from typing import Any, Deque, Dict, List, Optional, Tuple
+import asyncio
+import heapq
+import time
+from array import array
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
 
 from fastapi import APIRouter, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
+from ...timeutil import iso_from_ns, iso_now
+
 router = APIRouter(prefix="/api/v2.3-preview/observability", tags=["observability"])
 
 
 # ---- Minimal Observability Core (v0) ----
+# Metric key: plain name, or a (name, *label_values) tuple from the *_labeled fast paths
+MetricKey = Union[str, Tuple[Any, ...]]
+
+
+def _flat_key(key: MetricKey) -> str:
+    # tuple keys are exported in the legacy "name|label1|label2" form
+    return key if isinstance(key, str) else "|".join(map(str, key))
+
+
+class TimingWindow:
+    """Last ``maxlen`` observations with running sum/min/max (amortized O(1) per append).
+
+    min/max use monotonic deques of (seq, value); entries whose seq left the window are
+    dropped from the front. Only p95 still needs a pass over the window at snapshot time.
+    """
+
+    __slots__ = ("values", "total", "_seq", "_mins", "_maxs", "summary")
+
+    def __init__(self, maxlen: int) -> None:
+        self.values: Deque[float] = deque(maxlen=maxlen)
+        self.total = 0.0
+        self._seq = 0
+        self._mins: Deque[Tuple[int, float]] = deque()
+        self._maxs: Deque[Tuple[int, float]] = deque()
+        # memoized snapshot summary; cleared on append
+        self.summary: Optional[Dict[str, float]] = None
+
+    def append(self, v: float) -> None:
+        self.summary = None
+        values = self.values
+        maxlen = values.maxlen
+        if len(values) == maxlen:
+            self.total -= values[0]
+        values.append(v)
+        self._seq = seq = self._seq + 1
+        if seq % maxlen == 0:
+            # re-sum once per window turnover so float error from add/subtract cannot accumulate
+            self.total = sum(values)
+        else:
+            self.total += v
+        oldest = seq - maxlen
+        mins = self._mins
+        while mins and mins[-1][1] >= v:
+            mins.pop()
+        mins.append((seq, v))
+        if mins[0][0] <= oldest:
+            mins.popleft()
+        maxs = self._maxs
+        while maxs and maxs[-1][1] <= v:
+            maxs.pop()
+        maxs.append((seq, v))
+        if maxs[0][0] <= oldest:
+            maxs.popleft()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def min(self) -> float:
+        return self._mins[0][1]
+
+    def max(self) -> float:
+        return self._maxs[0][1]
+
+
 class Metrics:
     def __init__(self, max_timings: int = 200) -> None:
-        self.counters: Dict[str, int] = {}
-        self.timings: Dict[str, List[float]] = {}
+        self.counters: Counter[str] = Counter()
+        # recent-window timing series with running aggregates
+        self.timings: Dict[MetricKey, TimingWindow] = {}
         self.gauges: Dict[str, float] = {}
         self.labels: Dict[str, str] = {}
+        # gauges derived from live state, evaluated only when a snapshot is taken
+        self._gauge_fns: Dict[str, Callable[[], float]] = {}
         self._max_timings = max_timings
+        # labeled counters: dense int64 table, one slot per (name, *labels) key
+        self._slot_by_key: Dict[Tuple[Any, ...], int] = {}
+        self._slot_values = array("q")
+        # exported names, flattened once when a series first appears rather than per snapshot
+        self._slot_names: List[str] = []
+        self._timing_names: Dict[MetricKey, str] = {}
+        # copy of labels handed out by snapshot(); rebuilt on set_label, shared until then
+        self._labels_out: Dict[str, str] = {}
+        # last snapshot, reused while younger than _snap_ttl unless a write dirtied it. The
+        # per-request http series (*_labeled) leave that to drain_http_events, which invalidates
+        # for any request except /metrics polls: back-to-back polls share one snapshot, and the
+        # TTL bounds how stale the polls' own counts and registered gauges can be
+        self._dirty = True
+        self._snap_cache: Optional[Dict[str, Any]] = None
+        self._snap_expires = 0.0
+        self._snap_ttl = 0.1
 
     def inc(self, name: str, value: int = 1) -> None:
-        self.counters[name] = self.counters.get(name, 0) + value
-
-    def observe(self, name: str, ms: float) -> None:
-        arr = self.timings.get(name)
-        if arr is None:
-            arr = []
-            self.timings[name] = arr
-        arr.append(ms)
-        if len(arr) > self._max_timings:
-            # keep recent window
-            del arr[: len(arr) - self._max_timings]
+        self.counters[name] += value
+        self._dirty = True
+
+    def observe(self, name: MetricKey, ms: float) -> None:
+        w = self.timings.get(name)
+        if w is None:
+            w = self.timings[name] = TimingWindow(self._max_timings)
+            self._timing_names[name] = _flat_key(name)
+        w.append(ms)
+        self._dirty = True
+
+    # tuple-keyed fast paths: no per-call string formatting; flattened only in snapshot()
+    def inc_labeled(self, key: Tuple[Any, ...], value: int = 1) -> None:
+        i = self._slot_by_key.get(key)
+        if i is None:
+            i = len(self._slot_values)
+            self._slot_by_key[key] = i
+            self._slot_values.append(0)
+            self._slot_names.append(_flat_key(key))
+        self._slot_values[i] += value
+
+    def observe_labeled(self, key: Tuple[Any, ...], ms: float) -> None:
+        w = self.timings.get(key)
+        if w is None:
+            w = self.timings[key] = TimingWindow(self._max_timings)
+            self._timing_names[key] = _flat_key(key)
+        w.append(ms)
 
     # new gauge setter
     def set_gauge(self, name: str, value: float) -> None:
         self.gauges[name] = float(value)
+        self._dirty = True
+
+    def invalidate(self) -> None:
+        self._dirty = True
+
+    def register_gauge(self, name: str, fn: Callable[[], float]) -> None:
+        self._gauge_fns[name] = fn
 
     # new label setter
     def set_label(self, name: str, value: str) -> None:
         self.labels[name] = str(value)
+        self._labels_out = dict(self.labels)
+        self._dirty = True
 
-    def snapshot(self) -> Dict[str, Any]:
-        def percentiles(values: List[float], p: float) -> float:
-            if not values:
-                return 0.0
-            values_sorted = sorted(values)
-            k = int(round((len(values_sorted) - 1) * p))
-            return float(values_sorted[k])
+    def _gauge_values(self) -> Dict[str, float]:
+        values = dict(self.gauges)
+        for name, fn in self._gauge_fns.items():
+            try:
+                values[name] = float(fn())
+            except Exception:
+                pass
+        return values
 
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        if not self._dirty and self._snap_cache is not None and now < self._snap_expires:
+            return self._snap_cache
+        self._dirty = False
         timings_summary: Dict[str, Dict[str, float]] = {}
-        for k, vals in self.timings.items():
-            if not vals:
-                timings_summary[k] = {"count": 0, "avg_ms": 0.0, "p95_ms": 0.0, "min_ms": 0.0, "max_ms": 0.0}
-                continue
-            timings_summary[k] = {
-                "count": float(len(vals)),
-                "avg_ms": float(mean(vals)),
-                "p95_ms": float(percentiles(vals, 0.95)),
-                "min_ms": float(min(vals)),
-                "max_ms": float(max(vals)),
-            }
-        return {
-            "counters": dict(self.counters),
+        names = self._timing_names
+        for key, w in self.timings.items():
+            k = names[key]
+            summary = w.summary
+            if summary is None:
+                n = len(w)
+                if not n:
+                    summary = {"count": 0, "avg_ms": 0.0, "p95_ms": 0.0, "min_ms": 0.0, "max_ms": 0.0}
+                else:
+                    # p95 is the (n - idx)-th largest value: a top-k heap over ~5% of the window, not a full sort
+                    idx = int(round((n - 1) * 0.95))
+                    summary = {
+                        "count": float(n),
+                        "avg_ms": float(w.total / n),
+                        "p95_ms": float(heapq.nlargest(n - idx, w.values)[-1]),
+                        "min_ms": float(w.min()),
+                        "max_ms": float(w.max()),
+                    }
+                # only windows that received observations since the last snapshot are recomputed
+                w.summary = summary
+            timings_summary[k] = summary
+        counters: Dict[str, int] = dict(self.counters)
+        counters.update(zip(self._slot_names, self._slot_values))
+        snap = {
+            "counters": counters,
             "timings": timings_summary,
-            "gauges": dict(self.gauges),
-            "labels": dict(self.labels),
+            "gauges": self._gauge_values(),
+            "labels": self._labels_out,
             "window": self._max_timings,
-            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "updated_at": iso_now(),
         }
+        self._snap_cache = snap
+        self._snap_expires = now + self._snap_ttl
+        return snap
+
+
+@dataclass(slots=True)
+class LogEntry:
+    # slotted record: the buffer holds up to maxlen of these, one per request in steady state
+    ts: str
+    level: str
+    message: str
+    module: str
+    tags: List[str] = field(default_factory=list)
+    extra: Dict[str, Any] = field(default_factory=dict)
 
 
 class LogBuffer:
     def __init__(self, maxlen: int = 1000) -> None:
-        self._buf: Deque[Dict[str, Any]] = deque(maxlen=maxlen)
-
-    def add(self, level: str, message: str, *, module: str, tags: Optional[List[str]] = None, extra: Optional[Dict[str, Any]] = None) -> None:
-        self._buf.append(
-            {
-                "ts": datetime.now(timezone.utc).isoformat(),
-                "level": level.upper(),
-                "message": message,
-                "module": module,
-                "tags": tags or [],
-                "extra": extra or {},
-            }
+        # (epoch ns, search blob, entry): the numeric timestamp drives since-filtering, the blob
+        # (lowered message + "\x00" + comma-joined tags) serves q matching, the entry is returned
+        self._buf: Deque[Tuple[int, str, LogEntry]] = deque(maxlen=maxlen)
+
+    def add(
+        self,
+        level: str,
+        message: str,
+        *,
+        module: str,
+        tags: Optional[List[str]] = None,
+        extra: Optional[Dict[str, Any]] = None,
+        ts_ns: Optional[int] = None,
+    ) -> None:
+        # ts_ns: when the event happened, for entries recorded after the fact (deferred http events)
+        if ts_ns is None:
+            ts_ns = time.time_ns()
+        tags = tags or []
+        item = (
+            ts_ns,
+            (message + "\x00" + ",".join(tags)).lower(),
+            LogEntry(
+                iso_from_ns(ts_ns),
+                level.upper(),
+                message,
+                module,
+                tags,
+                extra or {},
+            ),
         )
+        buf = self._buf
+        if not buf or buf[-1][0] <= ts_ns:
+            buf.append(item)
+            return
+        # late entry: insert in time order so search() may stop at the first entry older than since;
+        # it belongs among the last few entries, so the walk back from the right is short
+        if len(buf) == buf.maxlen:
+            buf.popleft()
+        i = len(buf) - 1
+        while i > 0 and buf[i - 1][0] > ts_ns:
+            i -= 1
+        buf.insert(i, item)
 
     def search(
         self,
@@ -93,27 +268,23 @@ class LogBuffer:
         level: Optional[str] = None,
         since_seconds: Optional[int] = None,
         limit: int = 50,
-    ) -> List[Dict[str, Any]]:
-        now = datetime.now(timezone.utc)
-        results: List[Dict[str, Any]] = []
+    ) -> List[LogEntry]:
+        results: List[LogEntry] = []
+        cap = max(1, min(limit, 200))
         level_u = level.upper() if level else None
-        since_dt = now - timedelta(seconds=since_seconds) if since_seconds else None
-        for item in reversed(self._buf):  # newest first
-            if level_u and item.get("level") != level_u:
+        q_l = q.lower() if q else None
+        since_ns = time.time_ns() - since_seconds * 1_000_000_000 if since_seconds else None
+        for ts_ns, blob, item in reversed(self._buf):  # newest first
+            if since_ns is not None and ts_ns < since_ns:
+                # appended in time order: everything further back is older still
+                break
+            if level_u and item.level != level_u:
+                continue
+            # message or tags, case-insensitive; one scan over the prebuilt blob
+            if q_l and q_l not in blob:
                 continue
-            if q and (q not in item.get("message", "")):
-                # also match tags
-                if q not in ",".join(item.get("tags", [])):
-                    continue
-            if since_dt:
-                try:
-                    its = datetime.fromisoformat(item.get("ts"))
-                except Exception:
-                    its = now
-                if its < since_dt:
-                    continue
             results.append(item)
-            if len(results) >= max(1, min(limit, 200)):
+            if len(results) >= cap:
                 break
         return results
 
@@ -123,9 +294,64 @@ metrics = Metrics()
 logs = LogBuffer(maxlen=2000)
 
 
+# ---- Deferred per-request http events ----
+# ObservabilityMiddleware appends raw (method, path, route_path, status, dur_ns, end_ns, trace_id, level)
+# tuples; deque append/popleft are atomic, so the request path takes no lock and formats no strings.
+# Events are folded into metrics/logs by the lifespan drainer task and before every read below.
+# When the deque is full the oldest event is dropped; the middleware counts those drops.
+_LEVEL_NAMES = ("INFO", "WARN", "ERROR")
+HTTP_EVENTS_MAXLEN = 65536
+_METRICS_ROUTE = f"{router.prefix}/metrics"
+http_events: Deque[Tuple[str, str, str, int, int, int, str, int]] = deque(maxlen=HTTP_EVENTS_MAXLEN)
+# registered up front so the counter is visible (as 0) before anything is dropped
+metrics.inc("http_events_dropped_total", 0)
+
+
+def drain_http_events() -> int:
+    n = 0
+    stale = False
+    pop = http_events.popleft
+    while True:
+        try:
+            method, path, route_path, status, dur_ns, end_ns, trace_id, level = pop()
+        except IndexError:
+            break
+        # integer ns from the middleware; converted to ms only here, off the request path
+        dur_ms = dur_ns / 1e6
+        # metrics are labeled by route template (bounded label set); logs keep the concrete path.
+        # method and route_path arrive interned (middleware method table, route path_format at startup)
+        try:
+            metrics.inc_labeled(("http_requests_total", method, route_path, status), 1)
+            metrics.observe_labeled(("http_request_duration_ms", method, route_path), dur_ms)
+            logs.add(
+                _LEVEL_NAMES[level],
+                f"{method} {path} -> {status} in {dur_ms:.2f}ms",
+                module="http",
+                tags=[method, path, str(status), trace_id],
+                extra={"duration_ms": round(dur_ms, 2), "trace_id": trace_id},
+                ts_ns=end_ns,  # request completion time, not drain time
+            )
+        except Exception:
+            pass
+        if route_path != _METRICS_ROUTE:
+            stale = True
+        n += 1
+    if stale:
+        metrics.invalidate()
+    return n
+
+
+async def run_http_event_drainer(interval: float = 0.1) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        drain_http_events()
+
+
 @router.get("/metrics")
 async def get_metrics():
-    return metrics.snapshot()
+    drain_http_events()
+    # plain str/float dict: hand it to orjson directly instead of through jsonable_encoder
+    return ORJSONResponse(metrics.snapshot())
 
 
 class LogSearchRequest(BaseModel):
@@ -136,6 +362,17 @@ class LogSearchRequest(BaseModel):
     limit: int = 50
     since_seconds: Optional[int] = 3600
 
+
+def _log_search_response(items: List[LogEntry]) -> ORJSONResponse:
+    # LogEntry dataclasses go straight to orjson, skipping jsonable_encoder
+    return ORJSONResponse({
+        "count": len(items),
+        "returned": len(items),
+        "items": items,
+        "updated_at": iso_now(),
+    })
+
+
 @router.get("/logs/search")
 async def search_logs(
     q: Optional[str] = Query(default=None, description="text or tag contains"),
@@ -143,13 +380,9 @@ async def search_logs(
     limit: int = Query(default=50, ge=1, le=200),
     since_seconds: Optional[int] = Query(default=3600, ge=1),
 ):
+    drain_http_events()
     items = logs.search(q=q, level=level, since_seconds=since_seconds, limit=limit)
-    return {
-        "count": len(items),
-        "returned": len(items),
-        "items": items,
-        "updated_at": datetime.now(timezone.utc).isoformat(),
-    }
+    return _log_search_response(items)
 
 # New: POST variant for compatibility with tests expecting POST
 @router.post("/logs/search")
@@ -158,15 +391,11 @@ async def search_logs_post(payload: LogSearchRequest):
     q = payload.q or payload.query
     # validate and clamp limit range similar to GET endpoint
     limit = max(1, min((payload.limit or 50), 200))
+    drain_http_events()
     items = logs.search(
         q=q,
         level=payload.level,
         since_seconds=payload.since_seconds,
         limit=limit,
     )
-    return {
-        "count": len(items),
-        "returned": len(items),
-        "items": items,
-        "updated_at": datetime.now(timezone.utc).isoformat(),
-    }
\ No newline at end of file
+    return _log_search_response(items)
\ No newline at end of file
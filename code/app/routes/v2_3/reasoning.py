@@ -1,7 +1,9 @@
 from typing import List
-from uuid import uuid4
+import orjson
 from pydantic import BaseModel
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
+
+from ...ids import uuid4_str
 
 router = APIRouter(prefix="/api/v2.3-preview/reasoning", tags=["reasoning"])
 
@@ -23,10 +25,23 @@ class PlanResponse(BaseModel):
     steps: List[PlanStep]
 
 
-@router.post("/plan", response_model=PlanResponse)
+_MAX_PLAN_STEPS = 10
+
+# steps depend only on the clamped step count; built, validated and serialized once at import,
+# so a request only splices the fresh plan id into the cached "steps" JSON
+_PLAN_PREFIX = b'{"plan_id":"'
+_PLAN_STEPS_JSON: List[bytes] = [
+    b'","steps":'
+    + orjson.dumps([
+        PlanStep(index=i + 1, action=f"step-{i+1}", expected_outcome=f"outcome-{i+1}").model_dump()
+        for i in range(n)
+    ])
+    + b"}"
+    for n in range(1, _MAX_PLAN_STEPS + 1)
+]
+
+
+@router.post("/plan", responses={200: {"model": PlanResponse}})
 async def create_plan(req: PlanRequest):
-    steps = [
-        PlanStep(index=i + 1, action=f"step-{i+1}", expected_outcome=f"outcome-{i+1}")
-        for i in range(max(1, min(req.max_steps, 10)))
-    ]
-    return PlanResponse(plan_id=str(uuid4()), steps=steps)
\ No newline at end of file
+    n = max(1, min(req.max_steps, _MAX_PLAN_STEPS))
+    return Response(_PLAN_PREFIX + uuid4_str().encode() + _PLAN_STEPS_JSON[n - 1], media_type="application/json")
\ No newline at end of file
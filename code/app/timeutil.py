@@ -0,0 +1,42 @@
+from __future__ import annotations
+import time
+from datetime import datetime, timezone
+from typing import Tuple
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") for the most recent second formatted;
+# a single tuple so concurrent readers never see a mismatched pair
+_SECOND_CACHE: Tuple[int, str] = (-1, "")
+
+
+def iso_now() -> str:
+    """Current UTC time as ISO-8601, e.g. ``2025-08-28T09:55:23.123456+00:00``.
+
+    Same shape as ``datetime.now(timezone.utc).isoformat()`` (microseconds always
+    present); the date/time prefix is formatted at most once per second.
+    """
+    return iso_from_ns(time.time_ns())
+
+
+def iso_from_ns(epoch_ns: int) -> str:
+    """ISO-8601 string for a ``time.time_ns()`` value (see :func:`iso_now`)."""
+    global _SECOND_CACHE
+    sec, rem_ns = divmod(epoch_ns, 1_000_000_000)
+    cached_sec, prefix = _SECOND_CACHE
+    if sec != cached_sec:
+        prefix = _second_prefix(sec)
+        _SECOND_CACHE = (sec, prefix)
+    return f"{prefix}.{rem_ns // 1000:06d}+00:00"
+
+
+def iso_from_ns_uncached(epoch_ns: int) -> str:
+    """Like :func:`iso_from_ns`, but leaves the per-second cache alone.
+
+    For one-off timestamps away from the current second (e.g. expiry times), which
+    would otherwise evict the entry every ``iso_now()`` call relies on.
+    """
+    sec, rem_ns = divmod(epoch_ns, 1_000_000_000)
+    return f"{_second_prefix(sec)}.{rem_ns // 1000:06d}+00:00"
+
+
+def _second_prefix(sec: int) -> str:
+    return datetime.fromtimestamp(sec, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
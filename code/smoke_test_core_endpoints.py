@@ -3,10 +3,14 @@
 核心端到端冒烟测试脚本 - V2.3
 覆盖：cloud/status, observability/metrics, observability/logs/search, execution/act, reasoning/plan, memory/export
 目标：验证接口可用性、返回格式正确、状态码符合预期
+用法：python smoke_test_core_endpoints.py [--in-process]
+      --in-process 不启动服务器，经 ASGI 直接在进程内调用应用（需在 code/ 目录下运行）
 """
 
-import requests
-import json
+import asyncio
+import httpx
+import orjson
+import sys
 import time
 from datetime import datetime
 
@@ -14,17 +18,21 @@ from datetime import datetime
 BASE_URL = "http://127.0.0.1:8011"
 TIMEOUT = 10
 
+def _json(response):
+    """用 orjson 解析响应体（比 response.json() 的标准库解码更快）"""
+    return orjson.loads(response.content)
+
 def log(message):
     print(f"[{datetime.now().isoformat()}] {message}")
 
-def test_cloud_status():
+async def test_cloud_status(client):
     """测试 /api/v2.3-preview/cloud/status 接口"""
     url = f"{BASE_URL}/api/v2.3-preview/cloud/status"
     log(f"测试 cloud/status - GET {url}")
     
     try:
         # 无用户ID时应返回204 No Content
-        response = requests.get(url, timeout=TIMEOUT)
+        response = await client.get(url, timeout=TIMEOUT)
         if response.status_code == 204:
             log("✓ cloud/status (无user_id) - 204 No Content")
         else:
@@ -32,9 +40,9 @@ def test_cloud_status():
             return False
         
         # 带用户ID时应返回状态信息
-        response = requests.get(url, params={"user_id": "test_user"}, timeout=TIMEOUT)
+        response = await client.get(url, params={"user_id": "test_user"}, timeout=TIMEOUT)
         if response.status_code == 200:
-            data = response.json()
+            data = _json(response)
             if "status" in data and "consent_active" in data and "scopes" in data:
                 log(f"✓ cloud/status (user_id=test_user) - 200 OK, status={data['status']}")
             else:
@@ -49,15 +57,15 @@ def test_cloud_status():
         log(f"✗ cloud/status 异常: {e}")
         return False
 
-def test_observability_metrics():
+async def test_observability_metrics(client):
     """测试 /api/v2.3-preview/observability/metrics 接口"""
     url = f"{BASE_URL}/api/v2.3-preview/observability/metrics"
     log(f"测试 observability/metrics - GET {url}")
     
     try:
-        response = requests.get(url, timeout=TIMEOUT)
+        response = await client.get(url, timeout=TIMEOUT)
         if response.status_code == 200:
-            data = response.json()
+            data = _json(response)
             required_fields = ["counters", "timings", "gauges", "labels", "updated_at"]
             if all(field in data for field in required_fields):
                 log(f"✓ observability/metrics - 200 OK, counters={len(data.get('counters', {}))}")
@@ -73,16 +81,16 @@ def test_observability_metrics():
         log(f"✗ observability/metrics 异常: {e}")
         return False
 
-def test_observability_logs_search():
+async def test_observability_logs_search(client):
     """测试 /api/v2.3-preview/observability/logs/search 接口"""
     url = f"{BASE_URL}/api/v2.3-preview/observability/logs/search"
     log(f"测试 observability/logs/search - GET {url}")
     
     try:
         # GET 请求
-        response = requests.get(url, params={"limit": 10}, timeout=TIMEOUT)
+        response = await client.get(url, params={"limit": 10}, timeout=TIMEOUT)
         if response.status_code == 200:
-            data = response.json()
+            data = _json(response)
             if "count" in data and "returned" in data and "items" in data:
                 log(f"✓ observability/logs/search (GET) - 200 OK, count={data['count']}")
             else:
@@ -94,9 +102,9 @@ def test_observability_logs_search():
         
         # POST 请求
         post_data = {"query": "INFO", "limit": 5}
-        response = requests.post(url, json=post_data, timeout=TIMEOUT)
+        response = await client.post(url, json=post_data, timeout=TIMEOUT)
         if response.status_code == 200:
-            data = response.json()
+            data = _json(response)
             if "count" in data and "items" in data:
                 log(f"✓ observability/logs/search (POST) - 200 OK, count={data['count']}")
             else:
@@ -111,7 +119,7 @@ def test_observability_logs_search():
         log(f"✗ observability/logs/search 异常: {e}")
         return False
 
-def test_execution_act():
+async def test_execution_act(client):
     """测试 /api/v2.3-preview/execution/act 接口"""
     url = f"{BASE_URL}/api/v2.3-preview/execution/act"
     log(f"测试 execution/act - POST {url}")
@@ -121,9 +129,9 @@ def test_execution_act():
             "action": "test_action",
             "params": {"key": "value", "count": 42}
         }
-        response = requests.post(url, json=post_data, timeout=TIMEOUT)
+        response = await client.post(url, json=post_data, timeout=TIMEOUT)
         if response.status_code == 200:
-            data = response.json()
+            data = _json(response)
             if "success" in data and "output" in data:
                 log(f"✓ execution/act - 200 OK, success={data['success']}")
             else:
@@ -138,7 +146,7 @@ def test_execution_act():
         log(f"✗ execution/act 异常: {e}")
         return False
 
-def test_reasoning_plan():
+async def test_reasoning_plan(client):
     """测试 /api/v2.3-preview/reasoning/plan 接口"""
     url = f"{BASE_URL}/api/v2.3-preview/reasoning/plan"
     log(f"测试 reasoning/plan - POST {url}")
@@ -149,9 +157,9 @@ def test_reasoning_plan():
             "constraints": ["时间限制", "资源限制"],
             "max_steps": 3
         }
-        response = requests.post(url, json=post_data, timeout=TIMEOUT)
+        response = await client.post(url, json=post_data, timeout=TIMEOUT)
         if response.status_code == 200:
-            data = response.json()
+            data = _json(response)
             if "plan_id" in data and "steps" in data:
                 steps_count = len(data.get("steps", []))
                 log(f"✓ reasoning/plan - 200 OK, plan_id={data['plan_id'][:8]}..., steps={steps_count}")
@@ -167,16 +175,16 @@ def test_reasoning_plan():
         log(f"✗ reasoning/plan 异常: {e}")
         return False
 
-def test_memory_export():
+async def test_memory_export(client):
     """测试 /api/v2.3-preview/memory/export 接口"""
     url = f"{BASE_URL}/api/v2.3-preview/memory/export"
     log(f"测试 memory/export - GET {url}")
     
     try:
         # GET 请求
-        response = requests.get(url, timeout=TIMEOUT)
+        response = await client.get(url, timeout=TIMEOUT)
         if response.status_code == 200:
-            data = response.json()
+            data = _json(response)
             if "export_url" in data and "expires_at" in data:
                 log(f"✓ memory/export (GET) - 200 OK, export_url={data['export_url']}")
             else:
@@ -188,9 +196,9 @@ def test_memory_export():
         
         # POST 请求
         post_data = {"format": "json", "limit": 100}
-        response = requests.post(url, json=post_data, timeout=TIMEOUT)
+        response = await client.post(url, json=post_data, timeout=TIMEOUT)
         if response.status_code == 200:
-            data = response.json()
+            data = _json(response)
             if "export_url" in data and "expires_at" in data:
                 log(f"✓ memory/export (POST) - 200 OK, export_url={data['export_url']}")
             else:
@@ -205,14 +213,14 @@ def test_memory_export():
         log(f"✗ memory/export 异常: {e}")
         return False
 
-def main():
+async def _run(client):
     """执行所有冒烟测试"""
     log("开始核心端点冒烟测试")
     log(f"目标服务器: {BASE_URL}")
     
     # 先检查健康状态
     try:
-        health_response = requests.get(f"{BASE_URL}/health", timeout=5)
+        health_response = await client.get(f"{BASE_URL}/health", timeout=5)
         if health_response.status_code == 200:
             log("✓ 健康检查通过")
         else:
@@ -222,7 +230,7 @@ def main():
         log(f"✗ 无法连接到服务器: {e}")
         return False
     
-    # 执行各项测试
+    # 各测试相互独立，在同一事件循环上并发执行；共享一个 AsyncClient 连接池
     tests = [
         ("cloud/status", test_cloud_status),
         ("observability/metrics", test_observability_metrics),
@@ -235,16 +243,17 @@ def main():
     passed = 0
     total = len(tests)
     
-    for test_name, test_func in tests:
-        log(f"\n--- 测试 {test_name} ---")
-        try:
-            if test_func():
-                passed += 1
-                log(f"✓ {test_name} 通过")
-            else:
-                log(f"✗ {test_name} 失败")
-        except Exception as e:
-            log(f"✗ {test_name} 异常: {e}")
+    results = await asyncio.gather(
+        *(test_func(client) for _, test_func in tests), return_exceptions=True
+    )
+    for (test_name, _), result in zip(tests, results):
+        if isinstance(result, Exception):
+            log(f"✗ {test_name} 异常: {result}")
+        elif result:
+            passed += 1
+            log(f"✓ {test_name} 通过")
+        else:
+            log(f"✗ {test_name} 失败")
     
     log(f"\n=== 冒烟测试结果 ===")
     log(f"通过: {passed}/{total}")
@@ -257,6 +266,18 @@ def main():
         log(f"❌ {total-passed} 个测试失败")
         return False
 
+def main(in_process=False):
+    async def _main():
+        transport = None
+        if in_process:
+            # 进程内调用：绕过 TCP 回环与 HTTP 解析，请求直接交给 ASGI 应用；
+            # 复用 app.main 导入时已构建的应用实例，不再重复 create_app()
+            from app.main import app
+            transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await _run(client)
+    return asyncio.run(_main())
+
 if __name__ == "__main__":
-    success = main()
+    success = main(in_process="--in-process" in sys.argv[1:])
     exit(0 if success else 1)
\ No newline at end of file
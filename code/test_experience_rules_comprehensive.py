@@ -7,10 +7,12 @@ Experience Rules 全面测试脚本
 
 import requests
 import json
+import orjson
+import secrets
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from uuid import uuid4
 
 # 配置
 BASE_URL = "http://127.0.0.1:8011"
@@ -19,11 +21,14 @@ TIMEOUT = 10
 def log(message):
     print(f"[{datetime.now().isoformat()}] {message}")
 
+def _json(response):
+    """用 orjson 解析响应体（每个响应只解码一次，比 response.json() 更快）"""
+    return orjson.loads(response.content)
+
 def setup_headers():
-    """设置请求头，包含追踪ID"""
+    """每个请求独立的追踪ID（Content-Type 由会话统一设置）"""
     return {
-        "Content-Type": "application/json",
-        "x-trace-id": str(uuid4())[:8]
+        "x-trace-id": secrets.token_hex(4)  # 8 位十六进制，无需构造完整 UUID
     }
 
 class ExperienceRulesTestSuite:
@@ -32,19 +37,28 @@ class ExperienceRulesTestSuite:
     def __init__(self):
         self.base_url = f"{BASE_URL}/api/v2.3-preview/experience"
         self.created_rules = []  # 用于清理
+        # 复用连接（keep-alive）：所有请求共享同一个连接池
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json"})
         
     def cleanup(self):
         """清理测试数据"""
         log("清理测试数据...")
-        for rule_id in self.created_rules:
+        
+        def delete_rule(rule_id):
             try:
                 response = requests.delete(f"{self.base_url}/rules/{rule_id}", 
-                                        headers=setup_headers(), 
-                                        timeout=TIMEOUT)
+                                           headers=setup_headers(), 
+                                           timeout=TIMEOUT)
                 if response.status_code == 200:
                     log(f"✓ 清理规则: {rule_id}")
             except Exception as e:
                 log(f"✗ 清理失败 {rule_id}: {e}")
+        
+        # 各条删除互不依赖，并发执行（尽力而为，单条失败不影响其余）
+        if self.created_rules:
+            with ThreadPoolExecutor(max_workers=min(16, len(self.created_rules))) as ex:
+                list(ex.map(delete_rule, self.created_rules))
         self.created_rules.clear()
     
     def test_rule_crud_operations(self):
@@ -61,15 +75,15 @@ class ExperienceRulesTestSuite:
             "dedup": False  # 避免去重影响测试
         }
         
-        response = requests.post(f"{self.base_url}/rules", 
-                                json=create_data, 
-                                headers=setup_headers(), 
-                                timeout=TIMEOUT)
+        response = self.session.post(f"{self.base_url}/rules", 
+                                    json=create_data, 
+                                    headers=setup_headers(), 
+                                    timeout=TIMEOUT)
         if response.status_code != 200:
             log(f"✗ 创建规则失败: {response.status_code} - {response.text}")
             return False
             
-        rule = response.json()
+        rule = _json(response)
         rule_id = rule["id"]
         self.created_rules.append(rule_id)
         log(f"✓ 创建规则成功: {rule_id}")
@@ -83,14 +97,14 @@ class ExperienceRulesTestSuite:
             return False
             
         # 2. 读取规则 (GET /rules/{id})
-        response = requests.get(f"{self.base_url}/rules/{rule_id}", 
-                               headers=setup_headers(), 
-                               timeout=TIMEOUT)
+        response = self.session.get(f"{self.base_url}/rules/{rule_id}", 
+                                   headers=setup_headers(), 
+                                   timeout=TIMEOUT)
         if response.status_code != 200:
             log(f"✗ 读取规则失败: {response.status_code}")
             return False
             
-        retrieved_rule = response.json()
+        retrieved_rule = _json(response)
         if retrieved_rule["id"] != rule_id:
             log(f"✗ 读取规则ID不匹配: {retrieved_rule['id']}")
             return False
@@ -102,38 +116,38 @@ class ExperienceRulesTestSuite:
             "content": "更新后的内容"
         }
         
-        response = requests.put(f"{self.base_url}/rules/{rule_id}", 
-                               json=update_data, 
-                               headers=setup_headers(), 
-                               timeout=TIMEOUT)
+        response = self.session.put(f"{self.base_url}/rules/{rule_id}", 
+                                   json=update_data, 
+                                   headers=setup_headers(), 
+                                   timeout=TIMEOUT)
         if response.status_code != 200:
             log(f"✗ 更新规则失败: {response.status_code}")
             return False
             
-        updated_rule = response.json()
+        updated_rule = _json(response)
         if updated_rule["title"] != update_data["title"]:
             log(f"✗ 更新后标题不匹配: {updated_rule['title']}")
             return False
         log(f"✓ 更新规则成功: {rule_id}")
         
         # 4. 删除规则 (DELETE /rules/{id})
-        response = requests.delete(f"{self.base_url}/rules/{rule_id}", 
-                                  headers=setup_headers(), 
-                                  timeout=TIMEOUT)
+        response = self.session.delete(f"{self.base_url}/rules/{rule_id}", 
+                                      headers=setup_headers(), 
+                                      timeout=TIMEOUT)
         if response.status_code != 200:
             log(f"✗ 删除规则失败: {response.status_code}")
             return False
             
-        result = response.json()
+        result = _json(response)
         if result["status"] != "deleted":
             log(f"✗ 删除响应不正确: {result}")
             return False
         log(f"✓ 删除规则成功: {rule_id}")
         
         # 验证删除后无法读取
-        response = requests.get(f"{self.base_url}/rules/{rule_id}", 
-                               headers=setup_headers(), 
-                               timeout=TIMEOUT)
+        response = self.session.get(f"{self.base_url}/rules/{rule_id}", 
+                                   headers=setup_headers(), 
+                                   timeout=TIMEOUT)
         if response.status_code != 404:
             log(f"✗ 删除后仍能读取规则: {response.status_code}")
             return False
@@ -173,15 +187,23 @@ class ExperienceRulesTestSuite:
             }
         ]
         
-        created_ids = []
+        def create_rule(rule_data):
+            # 并发创建：requests.Session 非线程安全，每个请求单独发送
+            return requests.post(f"{self.base_url}/rules", 
+                                 json=rule_data, 
+                                 headers=setup_headers(), 
+                                 timeout=TIMEOUT)
+        
         for rule_data in test_rules:
             rule_data["dedup"] = False  # 避免去重
-            response = requests.post(f"{self.base_url}/rules", 
-                                    json=rule_data, 
-                                    headers=setup_headers(), 
-                                    timeout=TIMEOUT)
+        # 三条规则互不依赖，并发创建；map 保持与 test_rules 相同的顺序
+        with ThreadPoolExecutor(max_workers=len(test_rules)) as ex:
+            responses = list(ex.map(create_rule, test_rules))
+        
+        created_ids = []
+        for response in responses:
             if response.status_code == 200:
-                rule_id = response.json()["id"]
+                rule_id = _json(response)["id"]
                 created_ids.append(rule_id)
                 self.created_rules.append(rule_id)
         
@@ -197,15 +219,15 @@ class ExperienceRulesTestSuite:
         
         for case in test_cases:
             params = {k: v for k, v in case.items() if k not in ["expected_min", "desc"]}
-            response = requests.get(f"{self.base_url}/rules/search", 
-                                   params=params, 
-                                   headers=setup_headers(), 
-                                   timeout=TIMEOUT)
+            response = self.session.get(f"{self.base_url}/rules/search", 
+                                       params=params, 
+                                       headers=setup_headers(), 
+                                       timeout=TIMEOUT)
             if response.status_code != 200:
                 log(f"✗ 搜索失败 [{case['desc']}]: {response.status_code}")
                 return False
                 
-            result = response.json()
+            result = _json(response)
             if result["count"] < case["expected_min"]:
                 log(f"✗ 搜索结果不足 [{case['desc']}]: {result['count']} < {case['expected_min']}")
                 return False
@@ -226,15 +248,15 @@ class ExperienceRulesTestSuite:
             "tags": ["候选", "测试"]
         }
         
-        response = requests.post(f"{self.base_url}/candidates", 
-                                json=candidate_data, 
-                                headers=setup_headers(), 
-                                timeout=TIMEOUT)
+        response = self.session.post(f"{self.base_url}/candidates", 
+                                    json=candidate_data, 
+                                    headers=setup_headers(), 
+                                    timeout=TIMEOUT)
         if response.status_code != 200:
             log(f"✗ 创建候选规则失败: {response.status_code}")
             return False
             
-        candidate = response.json()
+        candidate = _json(response)
         candidate_id = candidate["id"]
         self.created_rules.append(candidate_id)
         
@@ -244,14 +266,14 @@ class ExperienceRulesTestSuite:
         log(f"✓ 创建候选规则成功: {candidate_id}, 状态: {candidate['status']}")
         
         # 2. 列出候选规则 (GET /candidates)
-        response = requests.get(f"{self.base_url}/candidates", 
-                               headers=setup_headers(), 
-                               timeout=TIMEOUT)
+        response = self.session.get(f"{self.base_url}/candidates", 
+                                   headers=setup_headers(), 
+                                   timeout=TIMEOUT)
         if response.status_code != 200:
             log(f"✗ 列出候选规则失败: {response.status_code}")
             return False
             
-        candidates = response.json()
+        candidates = _json(response)
         candidate_ids = [c["id"] for c in candidates["items"]]
         if candidate_id not in candidate_ids:
             log(f"✗ 候选规则未出现在列表中: {candidate_id}")
@@ -259,14 +281,14 @@ class ExperienceRulesTestSuite:
         log(f"✓ 候选规则列表正确，共 {candidates['count']} 个候选")
         
         # 3. 批准候选规则 (POST /candidates/{id}/approve)
-        response = requests.post(f"{self.base_url}/candidates/{candidate_id}/approve", 
-                                headers=setup_headers(), 
-                                timeout=TIMEOUT)
+        response = self.session.post(f"{self.base_url}/candidates/{candidate_id}/approve", 
+                                    headers=setup_headers(), 
+                                    timeout=TIMEOUT)
         if response.status_code != 200:
             log(f"✗ 批准候选规则失败: {response.status_code}")
             return False
             
-        approved = response.json()
+        approved = _json(response)
         if approved["status"] != "active":
             log(f"✗ 批准后状态不正确: {approved['status']}")
             return False
@@ -279,26 +301,26 @@ class ExperienceRulesTestSuite:
             "category": "reject_test"
         }
         
-        response = requests.post(f"{self.base_url}/candidates", 
-                                json=reject_data, 
-                                headers=setup_headers(), 
-                                timeout=TIMEOUT)
+        response = self.session.post(f"{self.base_url}/candidates", 
+                                    json=reject_data, 
+                                    headers=setup_headers(), 
+                                    timeout=TIMEOUT)
         if response.status_code != 200:
             log(f"✗ 创建待拒绝候选失败: {response.status_code}")
             return False
             
-        reject_candidate_id = response.json()["id"]
+        reject_candidate_id = _json(response)["id"]
         self.created_rules.append(reject_candidate_id)
         
         # 5. 拒绝候选规则 (POST /candidates/{id}/reject)
-        response = requests.post(f"{self.base_url}/candidates/{reject_candidate_id}/reject", 
-                                headers=setup_headers(), 
-                                timeout=TIMEOUT)
+        response = self.session.post(f"{self.base_url}/candidates/{reject_candidate_id}/reject", 
+                                    headers=setup_headers(), 
+                                    timeout=TIMEOUT)
         if response.status_code != 200:
             log(f"✗ 拒绝候选规则失败: {response.status_code}")
             return False
             
-        rejected = response.json()
+        rejected = _json(response)
         if rejected["status"] != "deprecated":
             log(f"✗ 拒绝后状态不正确: {rejected['status']}")
             return False
@@ -311,15 +333,15 @@ class ExperienceRulesTestSuite:
         log("\n--- 测试快照导入导出 ---")
         
         # 1. 导出快照 (GET /snapshot/export)
-        response = requests.get(f"{self.base_url}/snapshot/export", 
-                               params={"compact": True}, 
-                               headers=setup_headers(), 
-                               timeout=TIMEOUT)
+        response = self.session.get(f"{self.base_url}/snapshot/export", 
+                                   params={"compact": True}, 
+                                   headers=setup_headers(), 
+                                   timeout=TIMEOUT)
         if response.status_code != 200:
             log(f"✗ 导出快照失败: {response.status_code}")
             return False
             
-        snapshot = response.json()
+        snapshot = _json(response)
         if "count" not in snapshot or "items" not in snapshot or "mode" not in snapshot:
             log(f"✗ 快照格式不正确: {snapshot.keys()}")
             return False
@@ -346,27 +368,27 @@ class ExperienceRulesTestSuite:
             "upsert": False
         }
         
-        response = requests.post(f"{self.base_url}/snapshot/import", 
-                                json=test_import_data, 
-                                headers=setup_headers(), 
-                                timeout=TIMEOUT)
+        response = self.session.post(f"{self.base_url}/snapshot/import", 
+                                    json=test_import_data, 
+                                    headers=setup_headers(), 
+                                    timeout=TIMEOUT)
         if response.status_code != 200:
             log(f"✗ 导入快照失败: {response.status_code}")
             return False
             
-        import_result = response.json()
+        import_result = _json(response)
         if import_result["imported"] != 2:
             log(f"✗ 导入数量不正确: {import_result['imported']} != 2")
             return False
         log(f"✓ 导入快照成功: {import_result['imported']} 个规则, 总计: {import_result['total']}")
         
         # 记录导入的规则（通过搜索找到它们进行后续清理）
-        response = requests.get(f"{self.base_url}/rules/search", 
-                               params={"category": "import_test"}, 
-                               headers=setup_headers(), 
-                               timeout=TIMEOUT)
+        response = self.session.get(f"{self.base_url}/rules/search", 
+                                   params={"category": "import_test"}, 
+                                   headers=setup_headers(), 
+                                   timeout=TIMEOUT)
         if response.status_code == 200:
-            imported_rules = response.json()["items"]
+            imported_rules = _json(response)["items"]
             for rule in imported_rules:
                 self.created_rules.append(rule["id"])
         
@@ -385,15 +407,15 @@ class ExperienceRulesTestSuite:
             "dedup": False  # 第一次创建不去重
         }
         
-        response = requests.post(f"{self.base_url}/rules", 
-                                json=original_rule, 
-                                headers=setup_headers(), 
-                                timeout=TIMEOUT)
+        response = self.session.post(f"{self.base_url}/rules", 
+                                    json=original_rule, 
+                                    headers=setup_headers(), 
+                                    timeout=TIMEOUT)
         if response.status_code != 200:
             log(f"✗ 创建原始规则失败: {response.status_code}")
             return False
             
-        original = response.json()
+        original = _json(response)
         original_id = original["id"]
         self.created_rules.append(original_id)
         log(f"✓ 创建原始规则成功: {original_id}")
@@ -407,16 +429,16 @@ class ExperienceRulesTestSuite:
             "dedup": True  # 开启去重
         }
         
-        response = requests.post(f"{self.base_url}/rules", 
-                                json=duplicate_rule, 
-                                headers=setup_headers(), 
-                                timeout=TIMEOUT)
+        response = self.session.post(f"{self.base_url}/rules", 
+                                    json=duplicate_rule, 
+                                    headers=setup_headers(), 
+                                    timeout=TIMEOUT)
         if response.status_code != 200:
             log(f"✗ 创建重复规则请求失败: {response.status_code}")
             return False
             
         # 应该返回现有规则而不是创建新规则
-        duplicate = response.json()
+        duplicate = _json(response)
         if duplicate["id"] != original_id:
             # 如果返回了不同的ID，说明去重没生效，记录用于清理
             self.created_rules.append(duplicate["id"])
@@ -431,15 +453,15 @@ class ExperienceRulesTestSuite:
             "category": "dedup_test"
         }
         
-        response = requests.post(f"{self.base_url}/candidates", 
-                                json=candidate_duplicate, 
-                                headers=setup_headers(), 
-                                timeout=TIMEOUT)
+        response = self.session.post(f"{self.base_url}/candidates", 
+                                    json=candidate_duplicate, 
+                                    headers=setup_headers(), 
+                                    timeout=TIMEOUT)
         if response.status_code != 200:
             log(f"✗ 创建候选重复规则失败: {response.status_code}")
             return False
             
-        candidate = response.json()
+        candidate = _json(response)
         candidate_id = candidate["id"]
         self.created_rules.append(candidate_id)
         
@@ -0,0 +1,11 @@
+"""
+Integration test fixtures
+集成测试共享同一个会话级 TestClient：整个测试运行只启动一次应用 lifespan。
+"""
+import pytest
+
+
+@pytest.fixture(scope="session")
+def client(test_client):
+    """Session-scoped alias of ``test_client`` for integration modules."""
+    return test_client
@@ -0,0 +1,23 @@
+"""
+Integration tests for unified error responses
+验证 422 校验错误使用统一错误体，且不回显请求输入。
+"""
+import secrets
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.mark.integration
+def test_validation_error_details_omit_input(client: TestClient):
+    secret = "do-not-echo-" + secrets.token_hex(4)
+    resp = client.post("/api/v2.3-preview/reasoning/plan", json={"goal": secret, "max_steps": secret})
+    assert resp.status_code == 422
+    body = resp.json()
+    assert body["code"] == 40000
+    assert resp.headers["x-trace-id"] == body["trace_id"]
+    errors = body["details"]["errors"]
+    assert errors and errors[0]["loc"] == ["body", "max_steps"]
+    # 422 响应不回显请求体
+    assert all("input" not in e for e in errors)
+    assert secret not in resp.text
@@ -0,0 +1,54 @@
+"""
+Integration tests for experience rule updates and snapshot import
+验证 PUT /rules/{id} 在规则不存在与补丁类型错误时的状态码，以及快照导入的计数。
+"""
+import secrets
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+BASE = "/api/v2.3-preview/experience"
+
+
+@pytest.mark.integration
+def test_update_missing_rule_is_404_even_with_bad_patch(client: TestClient):
+    rid = str(uuid.uuid4())
+    for patch in ({"title": "ok"}, {"title": 5}):
+        resp = client.put(f"{BASE}/rules/{rid}", json=patch)
+        assert resp.status_code == 404, patch
+        assert resp.json()["message"] == "not_found"
+
+
+@pytest.mark.integration
+def test_update_existing_rule_applies_patch(client: TestClient):
+    rule_id = client.post(
+        f"{BASE}/rules",
+        json={"title": "update probe", "content": "before", "dedup": False},
+    ).json()["id"]
+    try:
+        upd = client.put(f"{BASE}/rules/{rule_id}", json={"content": "after", "weight": 0.5}).json()
+        assert (upd["title"], upd["content"], upd["weight"]) == ("update probe", "after", 0.5)
+    finally:
+        client.delete(f"{BASE}/rules/{rule_id}")
+
+
+@pytest.mark.integration
+def test_snapshot_import_counts_imported_and_duplicates(client: TestClient):
+    marker = secrets.token_hex(6)
+    items = [
+        {"title": f"import {marker} a", "content": "first"},
+        {"title": f"import {marker} a", "content": "first"},  # 批内重复
+        {"title": f"import {marker} b", "content": "second"},
+    ]
+    try:
+        first = client.post(f"{BASE}/snapshot/import", json={"items": items}).json()
+        assert (first["imported"], first["duplicates"]) == (2, 1)
+        # 再次导入同一批：全部按指纹去重
+        again = client.post(f"{BASE}/snapshot/import", json={"items": items}).json()
+        assert (again["imported"], again["duplicates"]) == (0, 3)
+        assert again["total"] == first["total"]
+    finally:
+        found = client.get(f"{BASE}/rules/search", params={"q": marker}).json()["items"]
+        for it in found:
+            client.delete(f"{BASE}/rules/{it['id']}")
@@ -0,0 +1,28 @@
+"""
+Integration tests for experience rule search
+验证标签过滤为大小写不敏感的精确匹配。
+"""
+import secrets
+
+import pytest
+from fastapi.testclient import TestClient
+
+BASE = "/api/v2.3-preview/experience"
+
+
+@pytest.mark.integration
+def test_search_tag_is_exact_case_insensitive_match(client: TestClient):
+    tag = f"Tag-{secrets.token_hex(4)}"
+    rule_id = client.post(
+        f"{BASE}/rules",
+        json={"title": "tag probe", "content": "exact tag match", "tags": [tag], "dedup": False},
+    ).json()["id"]
+    try:
+        hit = client.get(f"{BASE}/rules/search", params={"tag": tag.upper()}).json()
+        assert [it["id"] for it in hit["items"]] == [rule_id]
+        # 标签是精确匹配：前缀/子串不应命中
+        for partial in (tag[:-1], tag[1:], "tag"):
+            miss = client.get(f"{BASE}/rules/search", params={"tag": partial}).json()
+            assert rule_id not in [it["id"] for it in miss["items"]]
+    finally:
+        client.delete(f"{BASE}/rules/{rule_id}")
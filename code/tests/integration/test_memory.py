@@ -0,0 +1,25 @@
+"""
+Integration tests for memory sync
+验证 /memory/sync 接受任意结构的条目，且 OpenAPI 文档与之一致。
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+SYNC_URL = "/api/v2.3-preview/memory/sync"
+
+
+@pytest.mark.integration
+def test_memory_sync_accepts_free_form_items(client: TestClient):
+    resp = client.post(SYNC_URL, json={"items": [{"foo": 1}, {"id": "m1", "content": {"k": "v"}}]})
+    assert resp.status_code == 200
+    assert resp.json()["synced_count"] == 2
+
+
+@pytest.mark.integration
+@pytest.mark.api
+def test_memory_sync_item_schema_has_no_required_fields(client: TestClient):
+    schemas = client.get("/openapi.json").json()["components"]["schemas"]
+    item = schemas["MemorySyncRequest"]["properties"]["items"]["items"]
+    assert "required" not in item
+    assert item.get("additionalProperties") is True
+    assert "description" not in item
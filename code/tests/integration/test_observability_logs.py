@@ -0,0 +1,41 @@
+"""
+Integration tests for observability logs
+验证访问日志使用请求完成时刻作为时间戳，以及 q 搜索大小写不敏感。
+"""
+import secrets
+import time
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+SEARCH_URL = "/api/v2.3-preview/observability/logs/search"
+
+
+def _ts_ns(iso: str) -> int:
+    dt = datetime.fromisoformat(iso)
+    return int(dt.timestamp()) * 1_000_000_000 + dt.microsecond * 1000
+
+
+@pytest.mark.integration
+def test_access_log_timestamp_is_request_completion(client: TestClient):
+    probe = f"/__ts_probe_{secrets.token_hex(4)}"
+    t0 = time.time_ns()
+    client.get(probe)
+    t1 = time.time_ns()
+    time.sleep(0.02)  # 访问事件在下面的搜索请求中才被汇入
+    items = client.get(SEARCH_URL, params={"q": probe}).json()["items"]
+    assert len(items) == 1
+    ts = _ts_ns(items[0]["ts"])
+    # 微秒精度截断，允许 1µs 误差
+    assert t0 - 1000 <= ts <= t1
+
+
+
+@pytest.mark.integration
+def test_log_search_q_is_case_insensitive(client: TestClient):
+    probe = f"/__Case_Probe_{secrets.token_hex(4)}"
+    client.get(probe)
+    for q in (probe.lower(), probe.upper()):
+        items = client.get(SEARCH_URL, params={"q": q}).json()["items"]
+        assert [it["message"] for it in items if probe in it["message"]], q
@@ -0,0 +1,68 @@
+"""
+Integration tests for observability metrics
+验证 /observability/metrics 的快照缓存、标签与计时窗口聚合。
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.routes.v2_3.observability import metrics
+
+METRICS_URL = "/api/v2.3-preview/observability/metrics"
+
+
+@pytest.mark.integration
+@pytest.mark.metrics
+def test_metrics_polls_within_ttl_share_snapshot(client: TestClient, monkeypatch):
+    # 放宽 TTL，避免慢机器上两次轮询之间恰好过期
+    monkeypatch.setattr(metrics, "_snap_ttl", 60.0)
+    first = client.get(METRICS_URL).json()
+    second = client.get(METRICS_URL).json()
+    # 上一次 /metrics 请求的访问事件在第二次轮询时被汇入，但不应使快照失效
+    assert second == first
+
+
+@pytest.mark.integration
+@pytest.mark.metrics
+def test_metrics_poll_sees_requests_completed_since_last_poll(client: TestClient, monkeypatch):
+    # TTL 很长：只有汇入的非 /metrics 请求才能让快照失效
+    monkeypatch.setattr(metrics, "_snap_ttl", 60.0)
+    key = "http_requests_total|GET|/health|200"
+    before = client.get(METRICS_URL).json()["counters"].get(key, 0)
+    for _ in range(5):
+        assert client.get("/health").status_code == 200
+    after = client.get(METRICS_URL).json()["counters"][key]
+    assert after == before + 5
+
+
+@pytest.mark.integration
+@pytest.mark.metrics
+def test_metrics_explicit_write_invalidates_snapshot(client: TestClient, monkeypatch):
+    monkeypatch.setattr(metrics, "_snap_ttl", 60.0)
+    before = client.get(METRICS_URL).json()["counters"].get("test_snapshot_invalidation_total", 0)
+    metrics.inc("test_snapshot_invalidation_total", 1)
+    after = client.get(METRICS_URL).json()["counters"]["test_snapshot_invalidation_total"]
+    assert after == before + 1
+
+
+@pytest.mark.integration
+@pytest.mark.metrics
+def test_http_metrics_labeled_by_route_template(client: TestClient, monkeypatch):
+    monkeypatch.setattr(metrics, "_snap_ttl", 0.0)
+    rule_id = client.post(
+        "/api/v2.3-preview/experience/rules",
+        json={"title": "label probe", "content": "route template label", "dedup": False},
+    ).json()["id"]
+    try:
+        assert client.get(f"/api/v2.3-preview/experience/rules/{rule_id}").status_code == 200
+        client.get("/__label_probe_a")
+        client.get("/__label_probe_b")
+        data = client.get(METRICS_URL).json()
+    finally:
+        client.delete(f"/api/v2.3-preview/experience/rules/{rule_id}")
+    counters, timings = data["counters"], data["timings"]
+    assert counters["http_requests_total|GET|/api/v2.3-preview/experience/rules/{rule_id}|200"] >= 1
+    assert "http_request_duration_ms|GET|/api/v2.3-preview/experience/rules/{rule_id}" in timings
+    # 未匹配路由统一归入一个标签，原始路径不进入指标
+    assert counters["http_requests_total|GET|<unmatched>|404"] >= 2
+    assert not any(rule_id in k or "__label_probe" in k for k in (*counters, *timings))
+
@@ -5,20 +5,13 @@ Integration tests for OpenAPI and documentation routes
 import re
 import pytest
 from fastapi.testclient import TestClient
-from app.main import app
-
-
-@pytest.fixture(scope="module")
-def client_module():
-    with TestClient(app) as c:
-        yield c
 
 
 @pytest.mark.integration
 @pytest.mark.api
 @pytest.mark.smoke
-def test_openapi_json_available(client_module: TestClient):
-    resp = client_module.get("/openapi.json")
+def test_openapi_json_available(client: TestClient):
+    resp = client.get("/openapi.json")
     assert resp.status_code == 200
     ct = resp.headers.get("content-type", "").lower()
     assert "application/json" in ct
@@ -35,8 +28,8 @@ def test_openapi_json_available(client_module: TestClient):
 
 @pytest.mark.integration
 @pytest.mark.api
-def test_docs_custom_swagger_page(client_module: TestClient):
-    resp = client_module.get("/docs")
+def test_docs_custom_swagger_page(client: TestClient):
+    resp = client.get("/docs")
     assert resp.status_code == 200
     ct = resp.headers.get("content-type", "").lower()
     assert "text/html" in ct or "text/plain" in ct  # 某些服务器会返回 text/plain; 兼容处理
@@ -47,8 +40,8 @@ def test_docs_custom_swagger_page(client_module: TestClient):
 
 @pytest.mark.integration
 @pytest.mark.api
-def test_redoc_page(client_module: TestClient):
-    resp = client_module.get("/redoc")
+def test_redoc_page(client: TestClient):
+    resp = client.get("/redoc")
     assert resp.status_code == 200
     ct = resp.headers.get("content-type", "").lower()
     assert "text/html" in ct or "text/plain" in ct
@@ -60,8 +53,8 @@ def test_redoc_page(client_module: TestClient):
 @pytest.mark.integration
 @pytest.mark.api
 @pytest.mark.smoke
-def test_docs_lite_page(client_module: TestClient):
-    resp = client_module.get("/docs-lite")
+def test_docs_lite_page(client: TestClient):
+    resp = client.get("/docs-lite")
     assert resp.status_code == 200
     ct = resp.headers.get("content-type", "").lower()
     assert "text/html" in ct or "text/plain" in ct
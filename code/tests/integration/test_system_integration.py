@@ -5,12 +5,14 @@ V2.3 System Integration Tests
 重点测试：子系统间 API 调用、数据一致性、状态同步
 """
 
+import asyncio
+import httpx
 import pytest
 import requests
 from fastapi.testclient import TestClient
 from app.main import app
+from app.routes.v2_3.observability import metrics
 import json
-import time
 
 
 @pytest.mark.integration
@@ -56,8 +58,13 @@ class TestV23SystemIntegration:
         assert "export_url" in memory_data
         assert "expires_at" in memory_data
     
-    def test_observability_metrics_consistency(self, client: TestClient):
+    def test_observability_metrics_consistency(self, client: TestClient, monkeypatch):
         """测试可观测性指标在多系统间的一致性"""
+        # 关闭快照缓存 TTL，使每次读取都重新生成快照
+        monkeypatch.setattr(metrics, "_snap_ttl", 0.0)
+        plan_key = "http_requests_total|POST|/api/v2.3-preview/reasoning/plan|200"
+        act_key = "http_requests_total|POST|/api/v2.3-preview/execution/act|200"
+
         # 获取初始指标
         initial_metrics = client.get("/api/v2.3-preview/observability/metrics")
         assert initial_metrics.status_code == 200
@@ -74,16 +81,15 @@ class TestV23SystemIntegration:
             "params": {}
         })
         
-        # 等待指标更新
-        time.sleep(0.1)
-        
-        # 获取更新后的指标
+        # 获取更新后的指标：metrics 端点读取前会汇入待处理的请求事件
         updated_metrics = client.get("/api/v2.3-preview/observability/metrics")
         assert updated_metrics.status_code == 200
         updated_data = updated_metrics.json()
         
-        # 验证指标确实发生了变化
-        assert len(updated_data.get("metrics", [])) >= len(initial_data.get("metrics", []))
+        # 验证两个请求都计入了按路由模板标记的计数器
+        before, after = initial_data["counters"], updated_data["counters"]
+        assert after[plan_key] == before.get(plan_key, 0) + 1
+        assert after[act_key] == before.get(act_key, 0) + 1
     
     def test_experience_rules_with_execution_integration(self, client: TestClient):
         """测试经验规则与执行引擎的集成"""
@@ -128,10 +134,7 @@ class TestV23SystemIntegration:
             "max_steps": 1
         })
         
-        # 等待日志写入
-        time.sleep(0.1)
-        
-        # 搜索相关日志（使用 POST 以兼容 request body 中的 query 字段）
+        # 搜索相关日志：logs/search 读取前会汇入待处理的请求事件，且日志没有快照缓存；使用 POST 以兼容 request body 中的 query 字段
         log_params = {
             "query": "reasoning",
             "level": "info",
@@ -206,7 +209,7 @@ class TestV23SystemIntegration:
 class TestV23SystemHealth:
     """V2.3 系统健康度集成测试"""
     
-    def test_all_endpoints_health_check(self, client: TestClient):
+    def test_all_endpoints_health_check(self):
         """测试所有核心端点的健康状态"""
         endpoints_to_check = [
             ("/api/v2.3-preview/cloud/status", "GET"),
@@ -215,25 +218,29 @@ class TestV23SystemHealth:
             ("/api/v2.3-preview/experience/snapshot/export", "GET"),
         ]
         
+        async def probe_all():
+            # 各端点互不依赖：在同一事件循环内经 ASGI 并发请求
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as ac:
+                return await asyncio.gather(
+                    *(ac.get(ep) if method == "GET" else ac.post(ep, json={}) for ep, method in endpoints_to_check),
+                    return_exceptions=True,
+                )
+        
         health_results = {}
         
-        for endpoint, method in endpoints_to_check:
-            try:
-                if method == "GET":
-                    response = client.get(endpoint)
-                else:
-                    response = client.post(endpoint, json={})
-                
-                health_results[endpoint] = {
-                    "status_code": response.status_code,
-                    "healthy": response.status_code < 400,
-                    "response_time": "< 1s"  # FastAPI TestClient 是同步的
-                }
-            except Exception as e:
+        for (endpoint, _), response in zip(endpoints_to_check, asyncio.run(probe_all())):
+            if isinstance(response, Exception):
                 health_results[endpoint] = {
                     "status_code": 500,
                     "healthy": False,
-                    "error": str(e)
+                    "error": str(response)
+                }
+            else:
+                health_results[endpoint] = {
+                    "status_code": response.status_code,
+                    "healthy": response.status_code < 400,
+                    "response_time": "< 1s"
                 }
         
         # 检查所有端点健康状态
@@ -0,0 +1,4 @@
+"""
+Unit Tests for V2.3 System
+单元测试模块，覆盖不依赖应用客户端的内部组件
+"""
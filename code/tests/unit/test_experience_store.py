@@ -0,0 +1,117 @@
+"""
+Unit tests for ExperienceStore.search
+以逐条扫描的参照实现为基准，验证索引缩小候选集后的搜索结果不变。
+"""
+import random
+
+import pytest
+
+from app.routes.v2_3.experience import ExperienceRule, ExperienceStore
+
+
+def _brute_force(st: ExperienceStore, *, q=None, tag=None, category=None, status=None, limit=50):
+    """参照实现：逐条扫描，按同样的打分规则排序，同分保持插入顺序。"""
+    ql, tagl = (q or "").strip().lower(), (tag or "").strip().lower()
+    catl, stl = (category or "").strip().lower(), (status or "").strip().lower()
+    scored = []
+    for r in st._by_id.values():
+        if catl and (r.category or "").lower() != catl:
+            continue
+        if stl and (r.status or "").lower() != stl:
+            continue
+        if tagl and tagl not in [t.lower() for t in (r.tags or [])]:
+            continue
+        score = 0.0
+        if ql:
+            in_title, in_content = ql in (r.title or "").lower(), ql in (r.content or "").lower()
+            if not (in_title or in_content):
+                continue
+            score += (2.0 if in_title else 0.0) + (1.0 if in_content else 0.0)
+        score += (r.confidence or 0) * 0.5 + (r.weight or 0) * 0.5
+        scored.append((score, st._seq_by_id[r.id], r.id))
+    scored.sort(key=lambda x: (-x[0], x[1]))
+    return [rid for _, _, rid in scored[:max(1, min(limit, 200))]]
+
+
+def _random_store(rng: random.Random, steps: int, queries, limits):
+    """随机增删改规则，每一步用随机条件对比 search 与参照实现。"""
+
+    def words(n):
+        return "".join(rng.choice("abcAB ") for _ in range(n))
+
+    st = ExperienceStore()
+    ids = []
+    for step in range(steps):
+        op = rng.random()
+        if op < 0.6 or not ids:
+            rule = ExperienceRule(
+                title=words(rng.randint(0, 8)),
+                content=words(rng.randint(0, 20)),
+                category=rng.choice(["general", "X", "y"]),
+                tags=[words(3) for _ in range(rng.randint(0, 2))],
+                status=rng.choice(["active", "draft", "Deprecated"]),
+                confidence=rng.choice([0.3, 0.5, 0.7, 0.9]),
+                weight=rng.choice([0.5, 1.0]),
+            )
+            ids.append(st.add(rule, dedup=rng.random() < 0.5).id)
+        elif op < 0.8:
+            try:
+                st.update(rng.choice(ids), {"title": words(5), "category": rng.choice([None, "X"])})
+            except KeyError:
+                pass
+        else:
+            st.delete(rng.choice(ids))
+        kw = dict(
+            q=rng.choice(queries + [words(3), words(4)]),
+            tag=rng.choice([None, "a", "ab", words(3)]),
+            category=rng.choice([None, "x", "general"]),
+            status=rng.choice([None, "draft", "deprecated"]),
+            limit=rng.choice(limits),
+        )
+        got = [r.id for r in st.search(**kw)]
+        assert got == _brute_force(st, **kw), (step, kw)
+
+
+@pytest.mark.unit
+def test_indexed_search_matches_brute_force():
+    # 覆盖三元组索引（q 长度 < 3 与 ≥ 3）、分类/标签/状态索引，以及更新/删除后的索引维护
+    _random_store(random.Random(7), 600, [None, "", "a", "ab", "abc", " ab", "Ba"], [200])
+
+
+@pytest.mark.unit
+def test_top_k_search_matches_full_sort():
+    # limit 远小于匹配数：有界堆只保留前 k 个，顺序须与完整排序后截断一致
+    _random_store(random.Random(11), 600, [None, "", "a", "ab", "abc"], [1, 3, 7])
+
+
+@pytest.mark.unit
+def test_top_k_ties_keep_insertion_order():
+    st = ExperienceStore()
+    ids = [st.add(ExperienceRule(title=f"tie {i}", content="same score"), dedup=False).id for i in range(20)]
+    assert [r.id for r in st.search(q="same", limit=5)] == ids[:5]
+    # 后插入的高分规则排在最前，其余仍按插入顺序
+    best = st.add(ExperienceRule(title="same best", content="same", confidence=1.0, weight=1.0), dedup=False).id
+    assert [r.id for r in st.search(q="same", limit=3)] == [best] + ids[:2]
+
+
+@pytest.mark.unit
+def test_upper_bound_pruning_keeps_best_matches():
+    st = ExperienceStore()
+    # 先填满堆：高基础分、仅正文命中（2.0 分）
+    for i in range(10):
+        st.add(ExperienceRule(title=f"filler {i}", content="needle", confidence=1.0, weight=1.0), dedup=False)
+    # 基础分为 0，但标题+正文都命中（3.0 分）：上界 3.0 不低于堆最小值，不能被剪枝
+    late = st.add(ExperienceRule(title="needle late", content="needle", confidence=0.0, weight=0.0), dedup=False).id
+    # 高基础分但不含查询词：即使未被剪枝也必须被子串校验排除
+    st.add(ExperienceRule(title="other", content="haystack", confidence=1.0, weight=1.0), dedup=False)
+    got = st.search(q="needle", limit=3)
+    assert got[0].id == late
+    assert all("needle" in r.content for r in got)
+
+
+@pytest.mark.unit
+def test_pruning_with_equal_upper_bound_prefers_earlier_rule():
+    # 无 q 时上界即实际分数；候选集（分类索引）是无序集合，同分的较早规则仍须胜出
+    st = ExperienceStore()
+    ids = [st.add(ExperienceRule(title=f"r{i}", content="c", category="eq"), dedup=False).id for i in range(50)]
+    assert [r.id for r in st.search(category="eq", limit=3)] == ids[:3]
@@ -0,0 +1,39 @@
+"""
+Tests for app.ids
+验证 uuid4_str 生成的 UUID 版本/变体位，以及 fork 后子进程不复用父进程的随机池。
+"""
+import os
+import uuid
+
+import pytest
+
+from app.ids import uuid4_str
+
+
+@pytest.mark.unit
+def test_uuid4_str_is_rfc4122_version4():
+    ids = [uuid4_str() for _ in range(1000)]
+    assert len(set(ids)) == len(ids)
+    for s in ids:
+        u = uuid.UUID(s)
+        assert u.version == 4
+        assert u.variant == uuid.RFC_4122
+        assert str(u) == s
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_uuid4_str_differs_after_fork():
+    uuid4_str()  # 父进程已从随机池取过数据
+    r, w = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # child
+        os.close(r)
+        os.write(w, uuid4_str().encode())
+        os._exit(0)
+    os.close(w)
+    child_id = os.read(r, 64).decode()
+    os.close(r)
+    os.waitpid(pid, 0)
+    assert uuid.UUID(child_id).version == 4
+    assert child_id != uuid4_str()
@@ -0,0 +1,39 @@
+"""
+Unit tests for the observability LogBuffer
+验证晚到条目按时间顺序插入、since 过滤可提前结束，以及 q 大小写不敏感地匹配消息与标签。
+"""
+import time
+
+import pytest
+
+from app.routes.v2_3.observability import LogBuffer
+
+
+@pytest.mark.unit
+def test_log_buffer_late_entries_keep_time_order():
+    buf = LogBuffer(maxlen=4)
+    now = time.time_ns()
+    buf.add("INFO", "b", module="t", ts_ns=now - 2_000_000_000)
+    buf.add("INFO", "d", module="t", ts_ns=now)
+    # 晚到的条目插入到正确的时间位置，而不是追加到末尾
+    buf.add("INFO", "c", module="t", ts_ns=now - 1_000_000_000)
+    buf.add("INFO", "a", module="t", ts_ns=now - 3_000_000_000)
+    assert [e.message for e in buf.search(limit=10)] == ["d", "c", "b", "a"]
+    # 缓冲区已满：再插入晚到条目时淘汰最旧的一条
+    buf.add("INFO", "c2", module="t", ts_ns=now - 500_000_000)
+    assert [e.message for e in buf.search(limit=10)] == ["d", "c2", "c", "b"]
+    # since 过滤依赖时间顺序提前结束
+    recent = buf.search(since_seconds=1, limit=10)
+    assert [e.message for e in recent] == ["d", "c2"]
+
+
+
+@pytest.mark.unit
+def test_log_buffer_q_matches_message_and_tags_case_insensitively():
+    buf = LogBuffer(maxlen=10)
+    buf.add("INFO", "Snapshot Loaded", module="t", tags=["load"])
+    buf.add("WARN", "other", module="t", tags=["TraceABC"])
+    assert [e.message for e in buf.search(q="snapshot", limit=10)] == ["Snapshot Loaded"]
+    assert [e.message for e in buf.search(q="traceabc", limit=10)] == ["other"]
+    assert [e.message for e in buf.search(q="LOAD", limit=10)] == ["Snapshot Loaded"]
+    assert buf.search(q="missing", limit=10) == []
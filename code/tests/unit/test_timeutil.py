@@ -0,0 +1,28 @@
+"""
+Tests for app.timeutil
+验证 ISO 时间格式与 datetime.isoformat 一致，且一次性的远期时间不会挤掉每秒缓存。
+"""
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from app import timeutil
+from app.timeutil import iso_from_ns, iso_from_ns_uncached, iso_now
+
+
+@pytest.mark.unit
+def test_iso_formats_match_datetime_isoformat():
+    now_ns = time.time_ns()
+    for ns in (now_ns, now_ns + 3600 * 1_000_000_000, 1_700_000_000_000_000_000):
+        sec, rem = divmod(ns, 1_000_000_000)
+        expected = datetime.fromtimestamp(sec, timezone.utc).replace(microsecond=rem // 1000).isoformat(timespec="microseconds")
+        assert iso_from_ns(ns) == iso_from_ns_uncached(ns) == expected
+
+
+@pytest.mark.unit
+def test_uncached_expiry_keeps_second_cache():
+    iso_now()
+    cached = timeutil._SECOND_CACHE
+    iso_from_ns_uncached(time.time_ns() + 3600 * 1_000_000_000)
+    assert timeutil._SECOND_CACHE == cached
@@ -0,0 +1,34 @@
+"""
+Unit tests for observability timing windows
+验证 TimingWindow 的滑动 min/max/sum 与快照 p95 在窗口多次轮转后仍与参照值一致。
+"""
+import random
+
+import pytest
+
+from app.routes.v2_3.observability import Metrics, TimingWindow
+
+
+@pytest.mark.unit
+@pytest.mark.metrics
+def test_timing_window_aggregates_across_turnover():
+    rng = random.Random(3)
+    maxlen = 16
+    m = Metrics(max_timings=maxlen)
+    window = TimingWindow(maxlen)
+    seen = []
+    # 递增/递减/随机段交替，覆盖单调队列的弹出与过期淘汰，并跨越多次窗口轮转
+    for i in range(200):
+        v = float(i % 23) if i < 60 else float(100 - i % 17) if i < 120 else round(rng.uniform(0, 50), 3)
+        window.append(v)
+        m.observe("probe", v)
+        seen.append(v)
+        ref = seen[-maxlen:]
+        assert (window.min(), window.max(), len(window)) == (min(ref), max(ref), len(ref))
+        assert window.total == pytest.approx(sum(ref))
+        if i % 7 == 0 or i == 199:
+            summary = m.snapshot()["timings"]["probe"]
+            ordered = sorted(ref)
+            assert summary["p95_ms"] == ordered[int(round((len(ref) - 1) * 0.95))]
+            assert (summary["min_ms"], summary["max_ms"]) == (ordered[0], ordered[-1])
+            assert summary["count"] == len(ref)